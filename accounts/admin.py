@@ -14,7 +14,7 @@ class CustomUserAdmin(UserAdmin):
         (None, {'fields': ('email', 'password')}),
         (_('Personal info'), {'fields': ('first_name', 'last_name', 'username')}),
         (_('Role'), {'fields': ('is_employer', 'is_seeker')}),
-        (_('Email verification'), {'fields': ('email_verified', 'email_verification_token')}),
+        (_('Email verification'), {'fields': ('email_verified',)}),
         (_('Permissions'), {'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions')}),
         (_('Important dates'), {'fields': ('last_login', 'date_joined')}),
     )
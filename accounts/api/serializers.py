@@ -1,5 +1,7 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from accounts.models import User
+from accounts.tokens import CachedBlacklistRefreshToken
 from core.utils import send_verification_email
 
 
@@ -10,9 +12,10 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = [
             'id', 'email', 'first_name', 'last_name', 'is_employer', 'is_seeker',
-            'phone', 'company_name', 'company_website', 'skills', 'experience', 'profile_image'
+            'phone', 'company_name', 'company_website', 'skills', 'experience', 'profile_image',
+            'updated_at',
         ]
-        read_only_fields = ['id', 'is_employer', 'is_seeker', 'profile_image']
+        read_only_fields = ['id', 'is_employer', 'is_seeker', 'profile_image', 'updated_at']
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -44,3 +47,8 @@ class RegisterSerializer(serializers.ModelSerializer):
             pass
 
         return user
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    # Checks the blacklist through the cache before hitting the database
+    token_class = CachedBlacklistRefreshToken
@@ -1,34 +1,73 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import generics, permissions
 from accounts.models import User
 from .serializers import UserSerializer, RegisterSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.tokens import CachedBlacklistRefreshToken
 from rest_framework.response import Response
 
 
+def optimize_queryset(queryset, serializer_class):
+    """Load only the columns the serializer renders and join its forward relations."""
+    model = queryset.model
+    only_fields = []
+    related_fields = []
+    for name in serializer_class.Meta.fields:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Serializer-only fields (methods, properties) have no column
+            continue
+        if not field.concrete or field.many_to_many:
+            continue
+        only_fields.append(name)
+        if field.is_relation:
+            related_fields.append(name)
+
+    if related_fields:
+        queryset = queryset.select_related(*related_fields)
+    return queryset.only(*only_fields)
+
+
 class RegisterView(generics.CreateAPIView):
-    queryset = User.objects.all()
+    # Creating users never reads existing rows
+    queryset = User.objects.none()
     permission_classes = [permissions.AllowAny]
     serializer_class = RegisterSerializer
 
 
+def _user_etag(request, *args, **kwargs):
+    return f'"{request.user.pk}-{request.user.updated_at.timestamp()}"'
+
+
+def _user_last_modified(request, *args, **kwargs):
+    return request.user.updated_at
+
+
 class UserDetailView(generics.RetrieveUpdateAPIView):
-    queryset = User.objects.all()
+    queryset = optimize_queryset(User.objects.all(), UserSerializer)
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @method_decorator(condition(etag_func=_user_etag, last_modified_func=_user_last_modified))
+    def get(self, request, *args, **kwargs):
+        # Clients holding the current version get a 304 without any query or serialization
+        return super().get(request, *args, **kwargs)
+
     def get_object(self):
-        return self.request.user
+        # Reload from the narrowed queryset: request.user may come from the JWT cache
+        # and carries every column, while the serializer needs a fixed subset
+        obj = self.get_queryset().get(pk=self.request.user.pk)
+        self.check_object_permissions(self.request, obj)
+        return obj
 
 
 class ObtainTokenPairView(TokenObtainPairView):
     # Uses SimpleJWT's serializer to return access + refresh tokens
     permission_classes = [permissions.AllowAny]
 
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        return response
-
 
 class LogoutView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -36,7 +75,7 @@ class LogoutView(generics.GenericAPIView):
     def post(self, request, *args, **kwargs):
         try:
             refresh_token = request.data.get('refresh')
-            token = RefreshToken(refresh_token)
+            token = CachedBlacklistRefreshToken(refresh_token)
             token.blacklist()
         except Exception:
             pass
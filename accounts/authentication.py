@@ -0,0 +1,78 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+# Cache key pattern for the user behind an access token, keyed by the token's jti
+JWT_USER_CACHE_KEY = 'jwt_user_{}'
+
+# Per-user version stored with each cached entry; bumping it orphans all of the user's entries
+JWT_USER_VERSION_KEY = 'jwt_user_version_{}'
+
+# Keep cached users no longer than an access token is valid
+JWT_USER_CACHE_TTL = int(settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds())
+
+# Identity and role columns that most requests read; never the password hash.
+# Other fields load lazily from the database if a view touches them.
+JWT_USER_CACHE_FIELDS = (
+    'id', 'email', 'username', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser', 'is_employer', 'is_seeker',
+    'email_verified', 'profile_thumbnail', 'updated_at',
+)
+
+
+def _user_cache_version(user_id, cached):
+    """The user's cache version from ``cached``, starting a new one if it was lost."""
+    version_key = JWT_USER_VERSION_KEY.format(user_id)
+    version = cached.get(version_key)
+    if version is None:
+        # Start from the clock so a lost version never matches an old entry
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+    return version
+
+
+def clear_cached_user(user_id):
+    """Orphan the user's cached entries so the next authenticated request reloads them."""
+    cache.set(JWT_USER_VERSION_KEY.format(user_id), time.time_ns(), None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that caches a few user columns per token instead of querying on every request."""
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if user_id is None or jti is None:
+            # Let SimpleJWT raise its usual error for malformed tokens
+            return super().get_user(validated_token)
+
+        cache_key = JWT_USER_CACHE_KEY.format(jti)
+        cached = cache.get_many([cache_key, JWT_USER_VERSION_KEY.format(user_id)])
+        version = _user_cache_version(user_id, cached)
+        entry = cached.get(cache_key)
+
+        if entry is not None and entry['version'] == version:
+            fields = entry['fields']
+            user = self.user_model.from_db(self.user_model.objects.db, list(fields), list(fields.values()))
+        else:
+            try:
+                user = self.user_model.objects.only(*JWT_USER_CACHE_FIELDS).get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            fields = {name: getattr(user, name) for name in JWT_USER_CACHE_FIELDS}
+            # Store the file name, not the bound FieldFile
+            fields['profile_thumbnail'] = user.profile_thumbnail.name
+            cache.set(cache_key, {'version': version, 'fields': fields}, JWT_USER_CACHE_TTL)
+
+        # Checked on every request, cached or not
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return user
@@ -1,9 +1,54 @@
+import hashlib
+import time
+
 from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, PasswordResetForm, SetPasswordForm
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Failed (email, password) pairs are remembered briefly so repeated attempts
+# with the same bad credentials don't hit the password hasher again.
+FAILED_LOGIN_CACHE_KEY = 'failed_login_{}'
+FAILED_LOGIN_CACHE_TTL = 30
+
+# Per-email version mixed into those keys; bumping it forgets all of the email's failures
+FAILED_LOGIN_VERSION_KEY = 'failed_login_version_{}'
+
+
+def _keyed_digest(value):
+    """Short digest of ``value`` keyed with the secret key, so cache keys reveal nothing."""
+    return hashlib.blake2b(
+        value.encode(),
+        key=settings.SECRET_KEY.encode()[:64],
+        digest_size=16,
+    ).hexdigest()
+
+
+def _failed_login_version(email):
+    """Current failed-login version for ``email``, starting a new one if there is none."""
+    version_key = FAILED_LOGIN_VERSION_KEY.format(_keyed_digest(email.lower()))
+    version = cache.get(version_key)
+    if version is None:
+        # Start from the clock so a lost version never matches old entries
+        cache.add(version_key, time.time_ns(), FAILED_LOGIN_CACHE_TTL)
+        version = cache.get(version_key)
+    return version
+
+
+def clear_failed_logins(email):
+    """Forget the failed attempts remembered for ``email``, e.g. once its password or status changes."""
+    cache.set(FAILED_LOGIN_VERSION_KEY.format(_keyed_digest(email.lower())), time.time_ns(), FAILED_LOGIN_CACHE_TTL)
+
+
+def _failed_login_cache_key(email, password):
+    """Build a cache key that never stores the password itself."""
+    version = _failed_login_version(email)
+    return FAILED_LOGIN_CACHE_KEY.format(_keyed_digest(f'{version}\0{email.lower()}\0{password}'))
+
 
 class LoginForm(AuthenticationForm):
     """Form for user login."""
@@ -18,6 +63,23 @@ class LoginForm(AuthenticationForm):
         model = User
         fields = ['username', 'password']
 
+    def clean(self):
+        username = self.cleaned_data.get('username')
+        password = self.cleaned_data.get('password')
+        if not (username and password):
+            return super().clean()
+
+        cache_key = _failed_login_cache_key(username, password)
+        if cache.get(cache_key):
+            raise self.get_invalid_login_error()
+        try:
+            return super().clean()
+        except ValidationError as error:
+            # Only wrong credentials are remembered; an inactive account's error must stay specific
+            if error.code != 'inactive':
+                cache.set(cache_key, True, FAILED_LOGIN_CACHE_TTL)
+            raise
+
 
 class UserRegistrationForm(UserCreationForm):
     """Base form for user registration."""
@@ -0,0 +1,12 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id hasher with cost parameters tuned for the login path.
+
+    Keeps the ``argon2`` algorithm name, so existing hashes still verify and
+    Django re-hashes them on the next login when the parameters differ.
+    """
+    time_cost = 2
+    memory_cost = 64 * 1024
+    parallelism = 2
@@ -1,12 +1,22 @@
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.conf import settings
+
+from .authentication import CachedJWTAuthentication
 
 
 class JWTAuthMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
-        self.auth = JWTAuthentication()
+        self.auth = CachedJWTAuthentication()
+        self.skip_prefixes = tuple(settings.JWT_MIDDLEWARE_SKIP_PREFIXES)
 
     def __call__(self, request):
+        # Static/media paths never need a user, and without the cookie there is nothing to parse
+        if (
+            request.path.startswith(self.skip_prefixes)
+            or 'access_token=' not in request.META.get('HTTP_COOKIE', '')
+        ):
+            return self.get_response(request)
+
         access = request.COOKIES.get('access_token')
         if access:
             if 'HTTP_AUTHORIZATION' not in request.META:
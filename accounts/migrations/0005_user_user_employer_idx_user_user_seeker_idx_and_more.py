@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-15 22:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_user_email_verification_token'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_employer', True)), fields=['is_employer'], name='user_employer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_seeker', True)), fields=['is_seeker'], name='user_seeker_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email_verified', 'is_active'], name='user_verified_active_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_tokens(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    pending = User.objects.exclude(email_verification_token__isnull=True).exclude(email_verification_token='')
+    for user in pending.only('pk', 'email_verification_token').iterator():
+        digest = hashlib.blake2b(user.email_verification_token.encode(), digest_size=16).digest()
+        User.objects.filter(pk=user.pk).update(email_verification_token_hash=digest)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_user_employer_idx_user_user_seeker_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_verification_token_hash',
+            field=models.BinaryField(blank=True, max_length=16, null=True, unique=True),
+        ),
+        migrations.RunPython(hash_existing_tokens, migrations.RunPython.noop),
+    ]
@@ -1,37 +1,36 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
-import os
+from pathlib import Path
+import re
+
+# Anything outside [a-z0-9] is collapsed to a dash in upload filenames
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Storage folders for user uploads (storage keys always use forward slashes)
+RESUME_DIR = 'user_resumes'
+IMAGE_DIR = 'profile_images'
+THUMB_DIR = 'profile_thumbnails'
 
 
 def user_resume_upload_path(instance, filename):
     """Generate upload path for user resumes."""
-    # Get the file extension
-    ext = filename.split('.')[-1]
-    # Create a unique filename
-    filename = f"resume_user_{instance.id}_{instance.email.split('@')[0]}.{ext}"
-    # Return the full path
-    return os.path.join('user_resumes', filename)
+    # Unique filename from the user's slug and the original extension
+    return f"{RESUME_DIR}/resume_user_{instance.pk}_{instance.filename_slug}{Path(filename).suffix}"
 
 
 def user_profile_image_path(instance, filename):
     """Generate upload path for user profile images."""
-    # Get the file extension
-    ext = filename.split('.')[-1]
-    # Create a unique filename
-    filename = f"profile_{instance.id}_{instance.email.split('@')[0]}.{ext}"
-    # Return the full path
-    return os.path.join('profile_images', filename)
+    # Unique filename from the user's slug and the original extension
+    return f"{IMAGE_DIR}/profile_{instance.pk}_{instance.filename_slug}{Path(filename).suffix}"
 
 
 def user_profile_thumbnail_path(instance, filename):
     """Generate upload path for user profile thumbnails."""
-    # Get the file extension
-    ext = filename.split('.')[-1]
-    # Create a unique filename
-    filename = f"thumbnail_{instance.id}_{instance.email.split('@')[0]}.{ext}"
-    # Return the full path
-    return os.path.join('profile_thumbnails', filename)
+    # Unique filename from the user's slug and the original extension
+    return f"{THUMB_DIR}/thumbnail_{instance.pk}_{instance.filename_slug}{Path(filename).suffix}"
 
 
 class CustomUserManager(BaseUserManager):
@@ -43,13 +42,16 @@ class CustomUserManager(BaseUserManager):
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
-        user.save()
+        # New rows are always inserted; skip the UPDATE-then-INSERT probe
+        user.save(using=self._db, force_insert=True)
         return user
 
     def create_superuser(self, email, password=None, **extra_fields):
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_superuser', True)
         extra_fields.setdefault('is_active', True)
+        # Superusers are created from the shell and never receive a verification email
+        extra_fields.setdefault('email_verified', True)
 
         if extra_fields.get('is_staff') is not True:
             raise ValueError(_('Superuser must have is_staff=True.'))
@@ -69,7 +71,8 @@ class User(AbstractUser):
     
     # Email verification
     email_verified = models.BooleanField(default=False)
-    email_verification_token = models.CharField(max_length=100, blank=True, null=True)
+    # BLAKE2b digest of the emailed token; the plaintext is never stored
+    email_verification_token_hash = models.BinaryField(max_length=16, unique=True, blank=True, null=True)
     
     # Profile fields for job seekers
     resume = models.FileField(upload_to=user_resume_upload_path, blank=True, null=True)
@@ -84,6 +87,9 @@ class User(AbstractUser):
     profile_image = models.ImageField(upload_to=user_profile_image_path, blank=True, null=True)
     profile_thumbnail = models.ImageField(upload_to=user_profile_thumbnail_path, blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
+
+    # Bumped on every profile change; drives ETag/Last-Modified on the API
+    updated_at = models.DateTimeField(auto_now=True)
     
     # Set the email as the USERNAME_FIELD
     USERNAME_FIELD = 'email'
@@ -91,5 +97,18 @@ class User(AbstractUser):
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Partial indexes only hold the (few) rows matching each role filter
+            models.Index(fields=['is_employer'], name='user_employer_idx', condition=Q(is_employer=True)),
+            models.Index(fields=['is_seeker'], name='user_seeker_idx', condition=Q(is_seeker=True)),
+            models.Index(fields=['email_verified', 'is_active'], name='user_verified_active_idx'),
+        ]
+
     def __str__(self):
         return self.email
+
+    @cached_property
+    def filename_slug(self):
+        """Filesystem-safe slug of the email's local part, used in upload paths."""
+        return _SLUG_RE.sub('-', self.email.split('@', 1)[0].lower()).strip('-') or str(self.pk)
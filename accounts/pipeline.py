@@ -1,6 +1,19 @@
+from functools import cache
+
 from social_core.pipeline.partial import partial
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils import timezone
+
+from .authentication import clear_cached_user
+from .models import User
+
+
+@cache
+def _role_selection_url():
+    # URLconf doesn't change at runtime, so resolve once per process
+    return reverse('accounts:social_auth_role_selection')
+
 
 @partial
 def set_user_role(strategy, details, backend, user=None, is_new=False, *args, **kwargs):
@@ -14,20 +27,26 @@ def set_user_role(strategy, details, backend, user=None, is_new=False, *args, **
     if not role:
         # Store current partial pipeline data in session
         current_partial = kwargs.get('current_partial')
-        strategy.session_set('partial_pipeline_token', current_partial.token)
-        strategy.session_set('partial_pipeline_backend', backend.name)
+        strategy.session.update({
+            'partial_pipeline_token': current_partial.token,
+            'partial_pipeline_backend': backend.name,
+        })
         # Redirect to role selection page
-        return redirect(reverse('accounts:social_auth_role_selection'))
+        return redirect(_role_selection_url())
 
     # We have a role, let's set it
     if user:
-        # Set the role for existing user
-        if role == 'seeker':
-            user.is_seeker = True
-        else:
-            user.is_employer = True
+        # Set the role for existing user, writing only the changed columns
+        user.is_seeker = role == 'seeker'
+        user.is_employer = not user.is_seeker
         user.email_verified = True  # Since we got this from Google, we can trust the email
-        user.save()
+        User.objects.filter(pk=user.pk).update(
+            is_seeker=user.is_seeker,
+            is_employer=user.is_employer,
+            email_verified=True,
+            updated_at=timezone.now(),
+        )
+        clear_cached_user(user.pk)
     else:
         # For new user creation, update the details
         details['is_seeker'] = role == 'seeker'
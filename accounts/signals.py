@@ -1,13 +1,33 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from core.utils import send_verification_email
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from .authentication import clear_cached_user
+from .forms import clear_failed_logins
+from .tokens import cache_blacklisted_jti, uncache_blacklisted_jti
 
 User = get_user_model()
 
+# Verification emails are sent explicitly by the registration views/serializer,
+# so there is no post_save handler for them here.
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Keep the JWT user cache in sync with the database."""
+    clear_cached_user(instance.pk)
+
 @receiver(post_save, sender=User)
-def send_email_verification(sender, instance, created, **kwargs):
-    """Send email verification to new users."""
-    if created and not instance.email_verified and not instance.is_superuser:
-        # Only send verification if user is newly created, not verified, and not a superuser
-        send_verification_email(instance) 
\ No newline at end of file
+def forget_failed_logins(sender, instance, **kwargs):
+    """A new password or reactivated account must not be refused from the failed-login cache."""
+    clear_failed_logins(instance.email)
+
+@receiver(post_save, sender=BlacklistedToken)
+def cache_blacklisted_token(sender, instance, created, **kwargs):
+    """Mirror newly blacklisted refresh tokens into the cache."""
+    if created:
+        cache_blacklisted_jti(instance.token.jti, instance.token.expires_at)
+
+@receiver(post_delete, sender=BlacklistedToken)
+def uncache_blacklisted_token(sender, instance, **kwargs):
+    uncache_blacklisted_jti(instance.token.jti)
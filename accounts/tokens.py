@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+# Cache key pattern for blacklisted refresh token ids
+BLACKLIST_CACHE_KEY = 'token_blacklist_{}'
+
+# How long a token confirmed as not blacklisted skips the database check.
+# Blacklisting overwrites the entry at once (see accounts.signals), so this only
+# bounds staleness for rows written without signals.
+BLACKLIST_MISS_CACHE_TTL = 60
+
+
+def cache_blacklisted_jti(jti, expires_at):
+    """Remember a blacklisted token id until the token would expire anyway."""
+    ttl = int((expires_at - timezone.now()).total_seconds())
+    if ttl > 0:
+        cache.set(BLACKLIST_CACHE_KEY.format(jti), True, ttl)
+
+
+def uncache_blacklisted_jti(jti):
+    cache.delete(BLACKLIST_CACHE_KEY.format(jti))
+
+
+def seed_blacklist_cache():
+    """Load every unexpired blacklisted token id into the cache."""
+    rows = BlacklistedToken.objects.filter(
+        token__expires_at__gt=timezone.now()
+    ).values_list('token__jti', 'token__expires_at')
+
+    count = 0
+    for jti, expires_at in rows.iterator():
+        cache_blacklisted_jti(jti, expires_at)
+        count += 1
+
+    return count
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """Refresh token that checks the blacklist in the cache before the database."""
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        cache_key = BLACKLIST_CACHE_KEY.format(jti)
+        cached = cache.get(cache_key)
+
+        if cached:
+            raise TokenError(_('Token is blacklisted'))
+        if cached is not None:
+            # Recently confirmed as not blacklisted
+            return
+
+        # A missing entry proves nothing (it may have been evicted), so ask the table
+        try:
+            super().check_blacklist()
+        except TokenError:
+            cache_blacklisted_jti(jti, datetime_from_epoch(self.payload['exp']))
+            raise
+        cache.set(cache_key, False, BLACKLIST_MISS_CACHE_TTL)
@@ -1,22 +1,76 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import login, authenticate, logout
+from django.http import Http404
+from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db import transaction
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_ratelimit.decorators import ratelimit
 from django.views.decorators.cache import cache_page
 
 from .forms import UserRegistrationForm, EmployerRegistrationForm, SeekerRegistrationForm, LoginForm
 from .models import User
-from core.utils import send_verification_email, send_verification_success_email, generate_token
+from .authentication import clear_cached_user
+from .tokens import CachedBlacklistRefreshToken
+from core.utils import send_verification_email, send_verification_success_email, hash_token
 from core.tasks import generate_thumbnail_async, send_email_async
 from rest_framework_simplejwt.tokens import RefreshToken
 from PIL import Image
 from io import BytesIO
 from django.core.files.uploadedfile import InMemoryUploadedFile
+import os
 import sys
 
+IMAGE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'gif'})
+RESUME_EXTENSIONS = frozenset({'pdf', 'doc', 'docx'})
+MAX_UPLOAD_SIZE = 2 * 1024 * 1024  # 2 MB
+
+# Leading bytes expected for each allowed extension, so a renamed file is rejected
+UPLOAD_SIGNATURES = {
+    'jpg': (b'\xff\xd8\xff',),
+    'jpeg': (b'\xff\xd8\xff',),
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'gif': (b'GIF87a', b'GIF89a'),
+    'pdf': (b'%PDF',),
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+    'docx': (b'PK\x03\x04',),
+}
+
+
+def _validate_upload(upload, allowed_extensions, invalid_format_message):
+    """Return an error message for an unacceptable upload, or None."""
+    ext = os.path.splitext(upload.name)[1][1:].lower()
+    if ext not in allowed_extensions:
+        return invalid_format_message
+
+    if upload.size > MAX_UPLOAD_SIZE:
+        return _('File size too large. Maximum size is 2 MB.')
+
+    header = upload.read(8)
+    upload.seek(0)
+    if not header.startswith(UPLOAD_SIGNATURES[ext]):
+        return invalid_format_message
+
+    return None
+
+
+# Shared JWT cookie options; lifetimes follow SIMPLE_JWT so cookies and tokens expire together
+JWT_COOKIE_KWARGS = {'httponly': True, 'samesite': 'Lax', 'secure': not settings.DEBUG}
+ACCESS_COOKIE_MAX_AGE = int(settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds())
+REFRESH_COOKIE_MAX_AGE = int(settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
+
+
+def _set_jwt_cookies(response, user):
+    """Issue an access/refresh pair for ``user`` and store both in HttpOnly cookies."""
+    # Going through SimpleJWT records the OutstandingToken row logout needs for blacklisting
+    refresh = RefreshToken.for_user(user)
+    response.set_cookie('access_token', str(refresh.access_token), max_age=ACCESS_COOKIE_MAX_AGE, **JWT_COOKIE_KWARGS)
+    response.set_cookie('refresh_token', str(refresh), max_age=REFRESH_COOKIE_MAX_AGE, **JWT_COOKIE_KWARGS)
+
+
 def register(request):
     """View for selecting the type of registration (employer or job seeker)."""
     return render(request, 'accounts/register.html')
@@ -68,11 +122,17 @@ def seeker_register(request):
 
 def verify_email(request, token):
     """View for email verification."""
-    user = get_object_or_404(User, email_verification_token=token)
-    if not user.email_verified:
-        user.email_verified = True
-        user.email_verification_token = None
-        user.save()
+    # Narrow lookup on the indexed token digest; only the fields the success email needs
+    user = User.objects.filter(
+        email_verification_token_hash=hash_token(token)
+    ).only('id', 'email', 'first_name').first()
+    if user is None:
+        raise Http404
+    updated = User.objects.filter(pk=user.pk, email_verified=False).update(
+        email_verified=True, email_verification_token_hash=None, updated_at=timezone.now()
+    )
+    if updated:
+        clear_cached_user(user.pk)
         # Send verification success email
         send_verification_success_email(user)
         messages.success(request, _('Email verified successfully! You can now log in.'))
@@ -86,10 +146,7 @@ def verify_email(request, token):
 def resend_verification(request):
     """View for resending email verification."""
     if not request.user.email_verified:
-        # Generate new token if needed
-        if not request.user.email_verification_token:
-            request.user.email_verification_token = generate_token()
-            request.user.save()
+        # A new token is generated and stored with every email
         send_verification_email(request.user, request)
         messages.success(request, _('Verification email sent! Please check your inbox.'))
     else:
@@ -110,18 +167,11 @@ def login_view(request):
     if request.method == 'POST':
         form = LoginForm(request, data=request.POST)
         if form.is_valid():
-            email = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password')
-            # Authenticate credentials
-            user = authenticate(request, username=email, password=password)
+            # The form already authenticated the credentials
+            user = form.get_user()
             
             if user is not None:
                 if user.email_verified:
-                    # Issue JWT tokens and set as HttpOnly cookies
-                    refresh = RefreshToken.for_user(user)
-                    access_token = str(refresh.access_token)
-                    refresh_token = str(refresh)
-
                     next_page = request.GET.get('next', None)
                     if next_page:
                         response = redirect(next_page)
@@ -133,9 +183,8 @@ def login_view(request):
                         else:
                             response = redirect('core:home')
 
-                    # Set cookies (HttpOnly) — adjust secure and samesite for your deployment
-                    response.set_cookie('access_token', access_token, httponly=True, samesite='Lax', max_age=60*60)
-                    response.set_cookie('refresh_token', refresh_token, httponly=True, samesite='Lax', max_age=7*24*60*60)
+                    # Issue JWT tokens and set as HttpOnly cookies
+                    _set_jwt_cookies(response, user)
 
                     # Do not call Django session login (we use JWT now)
                     return response
@@ -171,86 +220,88 @@ def edit_profile(request):
         
         # Update basic info
         if first_name and last_name:
-            request.user.first_name = first_name
-            request.user.last_name = last_name
-            
-            if phone:
-                request.user.phone = phone
-                
-            # Handle profile image upload
+            user = request.user
             profile_image = request.FILES.get('profile_image')
+            resume = request.FILES.get('resume') if user.is_seeker else None
+
+            # Validate uploads before touching the user or deleting old files
             if profile_image:
-                # Check file extension
-                ext = profile_image.name.split('.')[-1].lower()
-                valid_extensions = ['jpg', 'jpeg', 'png', 'gif']
-                
-                if ext not in valid_extensions:
-                    messages.error(request, _('Invalid file format. Only JPG, JPEG, PNG, and GIF files are allowed.'))
+                error = _validate_upload(
+                    profile_image, IMAGE_EXTENSIONS,
+                    _('Invalid file format. Only JPG, JPEG, PNG, and GIF files are allowed.')
+                )
+                if error:
+                    messages.error(request, error)
                     return render(request, 'accounts/edit_profile.html')
-                
-                # Check file size (2 MB limit)
-                if profile_image.size > 2 * 1024 * 1024:
-                    messages.error(request, _('File size too large. Maximum size is 2 MB.'))
+            if resume:
+                error = _validate_upload(
+                    resume, RESUME_EXTENSIONS,
+                    _('Invalid file format. Only PDF, DOC, and DOCX files are allowed.')
+                )
+                if error:
+                    messages.error(request, error)
                     return render(request, 'accounts/edit_profile.html')
+
+            # Collect changed columns so the user is written with a single UPDATE
+            dirty = {'first_name', 'last_name', 'updated_at'}
+            user.first_name = first_name
+            user.last_name = last_name
+            
+            if phone:
+                user.phone = phone
+                dirty.add('phone')
                 
+            # Handle profile image upload
+            if profile_image:
                 # Delete old profile image and thumbnail if they exist
-                if request.user.profile_image:
-                    request.user.profile_image.delete(save=False)
-                if request.user.profile_thumbnail:
-                    request.user.profile_thumbnail.delete(save=False)
+                if user.profile_image:
+                    user.profile_image.delete(save=False)
+                if user.profile_thumbnail:
+                    user.profile_thumbnail.delete(save=False)
+                    dirty.add('profile_thumbnail')
                 
-                request.user.profile_image = profile_image
-                request.user.save()
-                
-                # Generate thumbnail asynchronously
-                generate_thumbnail_async.delay(
-                    request.user.id,
-                    request.user.profile_image.path
-                )
+                user.profile_image = profile_image
+                dirty.add('profile_image')
             
             # Update role-specific fields
-            if request.user.is_seeker:
-                # Handle resume upload
-                resume = request.FILES.get('resume')
+            if user.is_seeker:
                 if resume:
-                    # Check file extension
-                    ext = resume.name.split('.')[-1].lower()
-                    valid_extensions = ['pdf', 'doc', 'docx']
-                    
-                    if ext not in valid_extensions:
-                        messages.error(request, _('Invalid file format. Only PDF, DOC, and DOCX files are allowed.'))
-                        return render(request, 'accounts/edit_profile.html')
-                    
-                    # Check file size (2 MB limit)
-                    if resume.size > 2 * 1024 * 1024:
-                        messages.error(request, _('File size too large. Maximum size is 2 MB.'))
-                        return render(request, 'accounts/edit_profile.html')
-                    
-                    request.user.resume = resume
+                    user.resume = resume
+                    dirty.add('resume')
                 
                 # Update other seeker fields
                 skills = request.POST.get('skills')
                 experience = request.POST.get('experience')
                 
                 if skills:
-                    request.user.skills = skills
+                    user.skills = skills
+                    dirty.add('skills')
                 
                 if experience:
-                    request.user.experience = experience
+                    user.experience = experience
+                    dirty.add('experience')
                 
-            elif request.user.is_employer:
+            elif user.is_employer:
                 # Update employer fields
                 company_name = request.POST.get('company_name')
                 company_website = request.POST.get('company_website')
                 
                 if company_name:
-                    request.user.company_name = company_name
+                    user.company_name = company_name
+                    dirty.add('company_name')
                 
                 if company_website:
-                    request.user.company_website = company_website
+                    user.company_website = company_website
+                    dirty.add('company_website')
             
             # Save all changes
-            request.user.save()
+            user.save(update_fields=dirty)
+
+            if 'profile_image' in dirty:
+                # Generate thumbnail asynchronously once the new image is committed
+                image_name = user.profile_image.name
+                transaction.on_commit(lambda: generate_thumbnail_async.delay(user.id, image_name))
+
             messages.success(request, _('Profile updated successfully!'))
             return redirect('accounts:profile')
         else:
@@ -265,7 +316,7 @@ def logout_view(request):
     refresh_token = request.COOKIES.get('refresh_token') or request.POST.get('refresh')
     if refresh_token:
         try:
-            token = RefreshToken(refresh_token)
+            token = CachedBlacklistRefreshToken(refresh_token)
             token.blacklist()
         except Exception:
             pass
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.stats import rebuild_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount the admin dashboard counters from the database'
+
+    def handle(self, *args, **options):
+        stats = rebuild_dashboard_stats()
+        for name, value in stats.items():
+            self.stdout.write(f'{name}: {value}')
+        self.stdout.write(self.style.SUCCESS('Dashboard counters rebuilt.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.tokens import seed_blacklist_cache
+
+
+class Command(BaseCommand):
+    help = 'Load blacklisted JWT refresh tokens into the cache'
+
+    def handle(self, *args, **options):
+        count = seed_blacklist_cache()
+        self.stdout.write(self.style.SUCCESS(f'Cached {count} blacklisted token(s).'))
@@ -0,0 +1,82 @@
+import base64
+import binascii
+import hashlib
+from datetime import datetime
+from functools import cached_property
+
+from django.core.cache import cache
+from django.db.models import Q
+
+# Cache key pattern and lifetime for result counts, keyed by the filtered query
+COUNT_CACHE_KEY = 'queryset_count_{}'
+COUNT_CACHE_TTL = 60
+
+
+def encode_cursor(obj):
+    """Opaque cursor pointing just past ``obj`` in newest-first order."""
+    raw = f'{obj.created_at.isoformat()}|{obj.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the ``(created_at, pk)`` a cursor points past, or None if it is invalid."""
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+
+
+class CursorPage:
+    """
+    One page of keyset-paginated results, newest first.
+
+    Each page is a ``WHERE (created_at, id) < (cursor) ... LIMIT n`` index seek,
+    so deep pages cost the same as the first one, unlike OFFSET pagination.
+    """
+
+    def __init__(self, queryset, object_list, next_cursor, has_previous):
+        self._queryset = queryset
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_previous or self.has_next
+
+    @cached_property
+    def count(self):
+        """Total number of results across all pages, cached briefly per filter combination."""
+        query_hash = hashlib.blake2b(str(self._queryset.query).encode(), digest_size=16).hexdigest()
+        cache_key = COUNT_CACHE_KEY.format(query_hash)
+        count = cache.get(cache_key)
+        if count is None:
+            count = self._queryset.count()
+            cache.set(cache_key, count, COUNT_CACHE_TTL)
+        return count
+
+
+def paginate_by_cursor(queryset, cursor, per_page):
+    """Return the CursorPage of ``queryset`` that follows ``cursor`` (the first page if empty)."""
+    position = decode_cursor(cursor) if cursor else None
+    page_queryset = queryset.order_by('-created_at', '-id')
+    if position:
+        created_at, pk = position
+        page_queryset = page_queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    # Fetch one extra row to learn whether there is a next page without a COUNT
+    rows = list(page_queryset[:per_page + 1])
+    next_cursor = encode_cursor(rows[per_page - 1]) if len(rows) > per_page else None
+    return CursorPage(queryset, rows[:per_page], next_cursor, position is not None)
@@ -1,13 +1,32 @@
+import logging
+
 from celery import shared_task
-from django.core.mail import send_mail
-from PIL import Image
+from django.core.mail import send_mail, get_connection, EmailMultiAlternatives
+from PIL import Image, ImageOps, UnidentifiedImageError
 from io import BytesIO
 from django.core.files.uploadedfile import InMemoryUploadedFile
-import sys
 from django.conf import settings
+from django.core.cache import cache
 from accounts.models import User
-from jobs.models import Job
-from datetime import datetime, timedelta
+from jobs.models import Job, Application
+from jobs.documents import JobDocument
+from jobs.cache import JOB_DETAIL_CACHE_KEY, invalidate_job_lists
+from dashboard.stats import reset_dashboard_stats
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Profile thumbnails are square
+THUMBNAIL_SIZE = (150, 150)
+
+# Rows removed per DELETE statement by cleanup_expired_jobs
+CLEANUP_BATCH_SIZE = 10000
+
+# Elasticsearch bulk settings for reindex_jobs_async
+REINDEX_THREAD_COUNT = 4
+REINDEX_CHUNK_SIZE = 500
 
 @shared_task
 def send_email_async(subject, message, from_email, recipient_list, html_message=None, fail_silently=False):
@@ -22,33 +41,66 @@ def send_email_async(subject, message, from_email, recipient_list, html_message=
     )
 
 @shared_task
-def generate_thumbnail_async(user_id, profile_image_path):
+def send_emails_bulk_async(payloads, fail_silently=False):
+    """Send many emails over a single SMTP connection.
+
+    Each payload is a dict with the ``subject``, ``message``, ``from_email``,
+    ``recipient_list`` and optional ``html_message`` arguments of ``send_email_async``.
+    """
+    emails = []
+    for payload in payloads:
+        email = EmailMultiAlternatives(
+            payload['subject'],
+            payload['message'],
+            payload['from_email'],
+            payload['recipient_list'],
+        )
+        if payload.get('html_message'):
+            email.attach_alternative(payload['html_message'], 'text/html')
+        emails.append(email)
+
+    connection = get_connection(fail_silently=fail_silently)
+    return connection.send_messages(emails)
+
+@shared_task
+def send_application_email_async(application_id):
+    """Email the employer about a new application, with the resume attached."""
+    from .utils import send_application_notification_email
+
+    application = Application.objects.select_related('job__user', 'user').filter(pk=application_id).first()
+    if application is not None:
+        send_application_notification_email(application)
+
+# Storage read/write errors are usually transient and are retried with backoff
+@shared_task(
+    autoretry_for=(OSError,),
+    retry_backoff=True,
+    retry_kwargs={'max_retries': 3},
+    acks_late=True,
+)
+def generate_thumbnail_async(user_id, profile_image_name):
     """Generate thumbnail asynchronously using Celery."""
+    # Receives the storage name (not bytes) so the JSON task payload stays small
     try:
-        user = User.objects.get(id=user_id)
-        with Image.open(profile_image_path) as img:
+        user = User.objects.only('id', 'email', 'profile_image', 'profile_thumbnail').get(id=user_id)
+        with user.profile_image.storage.open(profile_image_name, 'rb') as image_file, Image.open(image_file) as img:
+            # For JPEGs, let libjpeg-turbo decode at 1/2, 1/4 or 1/8 scale (DCT scaling)
+            # while both sides stay at least the thumbnail size; no-op for other formats
+            img.draft('RGB', THUMBNAIL_SIZE)
+            
             # Convert to RGB if necessary
             if img.mode != 'RGB':
                 img = img.convert('RGB')
             
-            # Calculate aspect ratio to maintain proportions
-            output_size = (150, 150)
-            
-            # Create a thumbnail maintaining aspect ratio
-            img.thumbnail(output_size, Image.LANCZOS)
-            
-            # If the image is not square, crop it to make it square
-            if img.size[0] != img.size[1]:
-                min_size = min(img.size)
-                left = (img.size[0] - min_size) // 2
-                top = (img.size[1] - min_size) // 2
-                right = left + min_size
-                bottom = top + min_size
-                img = img.crop((left, top, right, bottom))
+            # Center-crop to a square and downscale in one resample pass.
+            # Pillow's wheels bundle libjpeg-turbo, so decode/encode already use its SIMD paths.
+            img = ImageOps.fit(img, THUMBNAIL_SIZE, Image.LANCZOS)
             
             # Save the thumbnail
             thumb_io = BytesIO()
             img.save(thumb_io, format='JPEG', quality=85)
+            # The write position is the encoded JPEG's byte length
+            size = thumb_io.tell()
             thumb_io.seek(0)
             
             # Create the thumbnail file
@@ -57,29 +109,81 @@ def generate_thumbnail_async(user_id, profile_image_path):
                 'ImageField',
                 f"{user.id}_thumb.jpg",
                 'image/jpeg',
-                sys.getsizeof(thumb_io),
-                None
+                size,
+                None,
             )
             
             # Save the thumbnail
             user.profile_thumbnail = thumbnail
-            user.save()
+            user.save(update_fields=['profile_thumbnail', 'updated_at'])
             
     except User.DoesNotExist:
         pass
-    except Exception as e:
-        print(f"Error generating thumbnail: {str(e)}")
+    except UnidentifiedImageError:
+        # Not an image Pillow can read; retrying would not help
+        logger.exception("thumbnail failed for user=%s path=%s", user_id, profile_image_name)
+    except OSError:
+        raise
+    except Exception:
+        logger.exception("thumbnail failed for user=%s path=%s", user_id, profile_image_name)
 
 @shared_task
 def cleanup_expired_jobs():
     """Clean up expired job listings."""
-    expiry_date = datetime.now() - timedelta(days=30)  # Jobs older than 30 days
-    Job.objects.filter(created_at__lt=expiry_date, status='expired').delete()
+    expiry_date = timezone.now() - timedelta(days=30)  # Jobs older than 30 days
+    expired = Job.objects.filter(created_at__lt=expiry_date, status='expired')
+
+    # Delete in batches with raw DELETEs: no rows are loaded into Python and
+    # each transaction (and its locks) stays short. Applications go first
+    # because the raw delete skips Django's cascade emulation.
+    doc = JobDocument()
+    while True:
+        ids = list(expired.values_list('pk', flat=True)[:CLEANUP_BATCH_SIZE])
+        if not ids:
+            break
+        # Raw deletes send no signals, so remove the documents from the search index
+        # ourselves; first, so an index failure leaves the rows to retry next run
+        doc.update([Job(pk=pk) for pk in ids], action='delete', refresh=False, raise_on_error=False)
+        with transaction.atomic():
+            Application.objects.filter(job_id__in=ids)._raw_delete(Application.objects.db)
+            Job.objects.filter(pk__in=ids)._raw_delete(Job.objects.db)
+
+    # Raw deletes skip the signals that maintain the dashboard counters and job caches
+    reset_dashboard_stats()
+    invalidate_job_lists()
 
 @shared_task
 def update_job_status():
     """Update job listing status based on expiry date."""
-    Job.objects.filter(
-        expiry_date__lt=datetime.now(),
+    now = timezone.now()
+    ids = list(Job.objects.filter(
+        expiry_date__lt=now,
         status='active'
-    ).update(status='expired')
\ No newline at end of file
+    ).values_list('pk', flat=True))
+    if not ids:
+        return
+    
+    # Expired jobs are also deactivated, which every public listing, search
+    # and counter already filters on
+    expired = Job.objects.filter(pk__in=ids)
+    expired.update(status='expired', is_active=False, updated_at=now)
+    
+    # update() sends no signals, so refresh the search index and caches here
+    JobDocument().update(expired.select_related('user'), refresh=False)
+    cache.delete_many([JOB_DETAIL_CACHE_KEY.format(pk) for pk in ids])
+    invalidate_job_lists()
+    reset_dashboard_stats()
+
+@shared_task
+def reindex_jobs_async():
+    """Rebuild the jobs search index with parallel bulk requests."""
+    doc = JobDocument()
+    # Refresh once at the end rather than after every bulk request
+    doc.update(
+        doc.get_indexing_queryset(),
+        refresh=False,
+        parallel=True,
+        thread_count=REINDEX_THREAD_COUNT,
+        chunk_size=REINDEX_CHUNK_SIZE,
+    )
+    doc._index.refresh()
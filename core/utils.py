@@ -1,36 +1,80 @@
+import hashlib
 import uuid
+from functools import lru_cache, partial
 from django.core.mail import send_mail, EmailMessage
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.db import transaction
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
 from django.urls import reverse
-from .tasks import send_email_async
+from .tasks import send_email_async, send_emails_bulk_async, send_application_email_async
+
+# Emails sent per bulk task, i.e. per SMTP connection
+EMAIL_BATCH_SIZE = 50
+
+
+@lru_cache(maxsize=None)
+def get_email_template(name):
+    """Compiled email template, looked up through the loader chain once per process."""
+    return get_template(name)
+
+
+@lru_cache(maxsize=None)
+def get_plain_text_template(name):
+    """Compiled ``.txt`` sibling of the HTML email template ``name``, or None if there is none."""
+    try:
+        return get_template(name.removesuffix('.html') + '.txt')
+    except TemplateDoesNotExist:
+        return None
+
+
+def queue_email(**kwargs):
+    """Enqueue ``send_email_async`` once the current transaction commits."""
+    transaction.on_commit(partial(send_email_async.delay, **kwargs))
+
+
+def queue_emails(payloads):
+    """Enqueue ``payloads`` for ``send_emails_bulk_async`` in batches once the transaction commits."""
+    payloads = list(payloads)
+    for start in range(0, len(payloads), EMAIL_BATCH_SIZE):
+        batch = payloads[start:start + EMAIL_BATCH_SIZE]
+        transaction.on_commit(partial(send_emails_bulk_async.delay, batch))
+
+
+def hash_token(token):
+    """Digest stored in place of a verification token; only the emailed copy is plaintext."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 
 def generate_token():
-    """Generate a unique token for email verification."""
-    return uuid.uuid4().hex
+    """Generate a unique token for email verification.
+
+    Returns ``(token, digest)``: the token goes into the email, the digest into the database.
+    """
+    token = uuid.uuid4().hex
+    return token, hash_token(token)
 
 
 def send_verification_email(user, request=None):
     """Send email verification to user."""
-    # Generate token if not already present
-    if not user.email_verification_token:
-        user.email_verification_token = generate_token()
-        user.save()
+    # Only the digest is stored, so every email carries a fresh token
+    token, user.email_verification_token_hash = generate_token()
+    user.save(update_fields=['email_verification_token_hash', 'updated_at'])
     
     # Generate verification URL
-    verification_url = f"{settings.SITE_URL}{reverse('accounts:verify_email', args=[user.email_verification_token])}"
+    verification_url = f"{settings.SITE_URL}{reverse('accounts:verify_email', args=[token])}"
     
     # Render email template
-    html_message = render_to_string('emails/welcome_email.html', {
+    html_message = get_email_template('emails/welcome_email.html').render({
         'user': user,
         'verification_url': verification_url,
     })
     
-    # Send email
+    # Queue email so registration doesn't wait on SMTP
     subject = 'Welcome to Job Portal - Verify Your Email'
     message = f'Hi {user.first_name},\n\nWelcome to Job Portal! Please verify your email by clicking on the following link: {verification_url}'
     
-    return send_email_async(
+    queue_email(
         subject=subject,
         message=message,
         from_email=settings.DEFAULT_FROM_EMAIL,
@@ -42,7 +86,7 @@ def send_verification_email(user, request=None):
 
 def send_verification_success_email(user):
     """Send verification success email to user."""
-    html_message = render_to_string('emails/verification_success.html', {
+    html_message = get_email_template('emails/verification_success.html').render({
         'user': user,
         'site_url': settings.SITE_URL,
     })
@@ -50,7 +94,7 @@ def send_verification_success_email(user):
     subject = 'Email Verified - Welcome to Job Portal!'
     message = f'Hi {user.first_name},\n\nYour email has been successfully verified. Welcome to Job Portal!'
     
-    return send_email_async(
+    queue_email(
         subject=subject,
         message=message,
         from_email=settings.DEFAULT_FROM_EMAIL,
@@ -60,9 +104,14 @@ def send_verification_success_email(user):
     )
 
 
+def queue_application_notification_email(application):
+    """Send the new-application email from a worker once the application is committed."""
+    transaction.on_commit(partial(send_application_email_async.delay, application.pk))
+
+
 def send_application_notification_email(application):
     """Send email to employer when a job seeker applies to their job."""
-    html_message = render_to_string('emails/application_notification.html', {
+    html_message = get_email_template('emails/application_notification.html').render({
         'application': application,
         'job': application.job,
         'employer': application.job.user,
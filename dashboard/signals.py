@@ -0,0 +1,47 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from jobs.models import Job, Application
+from .stats import job_stat_keys, application_stat_keys, apply_stat_deltas
+
+
+def _queue_stat_deltas(old_keys, new_keys):
+    # Counters only move once the change is committed
+    transaction.on_commit(partial(apply_stat_deltas, old_keys, new_keys))
+
+
+@receiver(post_save, sender=Job)
+def update_job_stats(sender, instance, created, **kwargs):
+    """Keep the job counters in step with is_active/is_approved changes."""
+    new_keys = job_stat_keys(instance.is_active, instance.is_approved)
+    if created:
+        _queue_stat_deltas([], new_keys)
+    elif instance.tracker.has_changed('is_active') or instance.tracker.has_changed('is_approved'):
+        old_keys = job_stat_keys(
+            instance.tracker.previous('is_active'),
+            instance.tracker.previous('is_approved'),
+        )
+        _queue_stat_deltas(old_keys, new_keys)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_stats(sender, instance, **kwargs):
+    _queue_stat_deltas(job_stat_keys(instance.is_active, instance.is_approved), [])
+
+
+@receiver(post_save, sender=Application)
+def update_application_stats(sender, instance, created, **kwargs):
+    """Keep the application counters in step with status changes."""
+    new_keys = application_stat_keys(instance.status)
+    if created:
+        _queue_stat_deltas([], new_keys)
+    elif instance.tracker.has_changed('status'):
+        _queue_stat_deltas(application_stat_keys(instance.tracker.previous('status')), new_keys)
+
+
+@receiver(post_delete, sender=Application)
+def remove_application_stats(sender, instance, **kwargs):
+    _queue_stat_deltas(application_stat_keys(instance.status), [])
@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from jobs.models import Job, Application
+
+# Cache keys for the admin dashboard counters
+JOB_STAT_KEYS = {
+    'total_jobs': 'stats:jobs:total',
+    'active_jobs': 'stats:jobs:active',
+    'approved_jobs': 'stats:jobs:approved',
+    'pending_approval': 'stats:jobs:pending',
+}
+APPLICATION_STAT_KEYS = {
+    'total_applications': 'stats:applications:total',
+    **{
+        f'{status}_applications': f'stats:applications:{status}'
+        for status, _label in Application.STATUS_CHOICES
+    },
+}
+STAT_KEYS = {**JOB_STAT_KEYS, **APPLICATION_STAT_KEYS}
+
+
+def job_stat_keys(is_active, is_approved):
+    """Counter keys a job with the given flags is counted under."""
+    keys = [JOB_STAT_KEYS['total_jobs']]
+    if is_active:
+        keys.append(JOB_STAT_KEYS['active_jobs'])
+        keys.append(JOB_STAT_KEYS['approved_jobs' if is_approved else 'pending_approval'])
+    return keys
+
+
+def application_stat_keys(status):
+    """Counter keys an application with the given status is counted under."""
+    return [APPLICATION_STAT_KEYS['total_applications'], f'stats:applications:{status}']
+
+
+def apply_stat_deltas(old_keys, new_keys):
+    """Move a row's contribution from ``old_keys`` to ``new_keys``."""
+    old_keys, new_keys = set(old_keys), set(new_keys)
+    try:
+        for key in new_keys - old_keys:
+            cache.incr(key)
+        for key in old_keys - new_keys:
+            cache.decr(key)
+    except ValueError:
+        # A counter is missing; drop them all so the next read rebuilds from the DB
+        reset_dashboard_stats()
+
+
+def rebuild_dashboard_stats():
+    """Recount every counter from the database and store the result."""
+    job_counts = Job.objects.aggregate(
+        total_jobs=Count('id'),
+        active_jobs=Count('id', filter=Q(is_active=True)),
+        approved_jobs=Count('id', filter=Q(is_active=True, is_approved=True)),
+        pending_approval=Count('id', filter=Q(is_active=True, is_approved=False)),
+    )
+    application_counts = Application.objects.aggregate(
+        total_applications=Count('id'),
+        **{
+            f'{status}_applications': Count('id', filter=Q(status=status))
+            for status, _label in Application.STATUS_CHOICES
+        },
+    )
+    stats = {**job_counts, **application_counts}
+    cache.set_many({STAT_KEYS[name]: value for name, value in stats.items()}, timeout=None)
+    return stats
+
+
+def reset_dashboard_stats():
+    """Forget the counters after bulk changes that bypass model signals."""
+    cache.delete_many(STAT_KEYS.values())
+
+
+def get_dashboard_stats():
+    """Read all counters in one round-trip, rebuilding them if any is missing."""
+    cached = cache.get_many(STAT_KEYS.values())
+    if len(cached) < len(STAT_KEYS):
+        return rebuild_dashboard_stats()
+    return {name: cached[key] for name, key in STAT_KEYS.items()}
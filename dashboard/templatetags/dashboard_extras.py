@@ -2,7 +2,7 @@ from django import template
 
 register = template.Library()
 
-@register.filter
+@register.filter(is_safe=True)
 def get_item(dictionary, key):
     """
     Template filter to access a dictionary value by key.
@@ -10,4 +10,15 @@ def get_item(dictionary, key):
     Usage:
         {{ dict_value|get_item:key }}
     """
-    return dictionary.get(key, 0) 
\ No newline at end of file
+    return dictionary.get(key, 0) if dictionary else 0
+
+
+@register.simple_tag
+def app_count(stats, job_id):
+    """
+    Template tag returning the application count for a job.
+    
+    Usage:
+        {% app_count application_stats job.id %}
+    """
+    return stats.get(job_id, 0) if stats else 0
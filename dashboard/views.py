@@ -2,23 +2,56 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Case, When
 from django.contrib.admin.views.decorators import staff_member_required
 from django.http import JsonResponse, FileResponse
 import os
 
+from jobs.documents import JobDocument
 from jobs.models import Job, Application
+from .stats import get_dashboard_stats
+
+# Columns the job listing templates render; skips the long description/requirements text
+JOB_LIST_FIELDS = (
+    'id', 'user_id', 'title', 'company', 'location', 'job_type',
+    'is_active', 'is_approved', 'created_at',
+)
+
+# Application status lookups for the AJAX status update
+APPLICATION_STATUSES = frozenset(status for status, _label in Application.STATUS_CHOICES)
+APPLICATION_STATUS_DISPLAY = dict(Application.STATUS_CHOICES)
+APPLICATION_BADGE_CLASSES = {
+    'pending': 'bg-warning text-dark',
+    'reviewing': 'bg-info',
+    'shortlisted': 'bg-primary',
+    'rejected': 'bg-danger',
+    'accepted': 'bg-success',
+}
+
+# Maximum number of Elasticsearch hits the moderation search hydrates
+MODERATION_SEARCH_LIMIT = 200
+
+
+def _status_counts(applications):
+    """Count applications in total and per status with a single aggregate query."""
+    return applications.aggregate(
+        total=Count('id'),
+        **{
+            status: Count('id', filter=Q(status=status))
+            for status, _label in Application.STATUS_CHOICES
+        },
+    )
 
 
 @login_required
 def dashboard(request):
-    """Main dashboard view, redirects to appropriate dashboard based on user role."""
+    """Main dashboard view, renders the dashboard for the user's role in place."""
     if request.user.is_employer:
-        return redirect('dashboard:employer_dashboard')
+        return _render_employer_dashboard(request)
     elif request.user.is_seeker:
-        return redirect('dashboard:seeker_dashboard')
+        return _render_seeker_dashboard(request)
     elif request.user.is_staff:
-        return redirect('dashboard:admin_dashboard')
+        return _render_admin_dashboard(request)
     else:
         messages.warning(request, _('Invalid user role.'))
         return redirect('core:home')
@@ -31,27 +64,32 @@ def employer_dashboard(request):
         messages.warning(request, _('You do not have access to this page.'))
         return redirect('core:home')
     
-    jobs = Job.objects.filter(user=request.user).order_by('-created_at')
-    
-    # Get application statistics
-    total_applications = 0
-    application_stats = {}
-    
-    for job in jobs:
-        job_applications = job.applications.count()
-        total_applications += job_applications
-        application_stats[job.id] = job_applications
-    
-    active_jobs = jobs.filter(is_active=True).count()
-    approved_jobs = jobs.filter(is_active=True, is_approved=True).count()
-    pending_jobs = jobs.filter(is_active=True, is_approved=False).count()
+    return _render_employer_dashboard(request)
+
+
+def _render_employer_dashboard(request):
+    """Render the employer dashboard; callers check the role."""
+    jobs = Job.objects.filter(user=request.user).only(*JOB_LIST_FIELDS).annotate(
+        app_count=Count('applications')
+    ).order_by('-created_at')
+    
+    # Get application statistics from the annotated counts
+    application_stats = {job.id: job.app_count for job in jobs}
+    total_applications = sum(application_stats.values())
+    
+    job_counts = Job.objects.filter(user=request.user).aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        approved=Count('id', filter=Q(is_active=True, is_approved=True)),
+        pending=Count('id', filter=Q(is_active=True, is_approved=False)),
+    )
     
     return render(request, 'dashboard/employer_dashboard.html', {
         'jobs': jobs,
-        'active_jobs': active_jobs,
-        'approved_jobs': approved_jobs,
-        'pending_jobs': pending_jobs,
-        'total_jobs': jobs.count(),
+        'active_jobs': job_counts['active'],
+        'approved_jobs': job_counts['approved'],
+        'pending_jobs': job_counts['pending'],
+        'total_jobs': job_counts['total'],
         'total_applications': total_applications,
         'application_stats': application_stats,
     })
@@ -64,23 +102,20 @@ def seeker_dashboard(request):
         messages.warning(request, _('You do not have access to this page.'))
         return redirect('core:home')
     
-    applications = Application.objects.filter(user=request.user).order_by('-applied_at')
+    return _render_seeker_dashboard(request)
+
+
+def _render_seeker_dashboard(request):
+    """Render the job seeker dashboard; callers check the role."""
+    applications = Application.objects.filter(user=request.user).select_related('job').order_by('-applied_at')
     
     # Get status counts
-    pending = applications.filter(status='pending').count()
-    reviewing = applications.filter(status='reviewing').count()
-    shortlisted = applications.filter(status='shortlisted').count()
-    rejected = applications.filter(status='rejected').count()
-    accepted = applications.filter(status='accepted').count()
+    stats = _status_counts(applications)
     
     return render(request, 'dashboard/seeker_dashboard.html', {
         'applications': applications,
-        'total_applications': applications.count(),
-        'pending': pending,
-        'reviewing': reviewing,
-        'shortlisted': shortlisted,
-        'rejected': rejected,
-        'accepted': accepted,
+        'total_applications': stats.pop('total'),
+        **stats,
     })
 
 
@@ -91,7 +126,7 @@ def applications(request):
         messages.warning(request, _('You do not have access to this page.'))
         return redirect('core:home')
     
-    applications = Application.objects.filter(user=request.user).order_by('-applied_at')
+    applications = Application.objects.filter(user=request.user).select_related('job').order_by('-applied_at')
     return render(request, 'dashboard/applications.html', {'applications': applications})
 
 
@@ -103,31 +138,25 @@ def job_applications(request, job_id):
         return redirect('core:home')
     
     job = get_object_or_404(Job, id=job_id, user=request.user)
-    applications = job.applications.all().order_by('-applied_at')
+    applications = job.applications.select_related('user').order_by('-applied_at')
     
     # Get status counts
-    pending = applications.filter(status='pending').count()
-    reviewing = applications.filter(status='reviewing').count()
-    shortlisted = applications.filter(status='shortlisted').count()
-    rejected = applications.filter(status='rejected').count()
-    accepted = applications.filter(status='accepted').count()
+    stats = _status_counts(applications)
     
     return render(request, 'dashboard/job_applications.html', {
         'job': job,
         'applications': applications,
-        'total_applications': applications.count(),
-        'pending': pending,
-        'reviewing': reviewing,
-        'shortlisted': shortlisted,
-        'rejected': rejected,
-        'accepted': accepted,
+        'total_applications': stats.pop('total'),
+        **stats,
     })
 
 
 @login_required
 def application_detail(request, application_id):
     """View for application details."""
-    application = get_object_or_404(Application, id=application_id)
+    application = get_object_or_404(
+        Application.objects.select_related('job', 'job__user', 'user'), id=application_id
+    )
     
     # Check permission
     if request.user.is_seeker and application.user != request.user:
@@ -141,27 +170,20 @@ def application_detail(request, application_id):
     # If employer is updating the status
     if request.user.is_employer and request.method == 'POST':
         new_status = request.POST.get('status')
-        if new_status in [status[0] for status in Application.STATUS_CHOICES]:
+        if new_status in APPLICATION_STATUSES:
             application.status = new_status
-            application.save()
+            # Skip the write when the employer re-submits the current status
+            if application.tracker.has_changed('status'):
+                application.save(update_fields=['status', 'updated_at'])
             
             # If it's an AJAX request, return JSON response
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                status_display = dict(Application.STATUS_CHOICES)[new_status]
-                badge_class = {
-                    'pending': 'bg-warning text-dark',
-                    'reviewing': 'bg-info',
-                    'shortlisted': 'bg-primary',
-                    'rejected': 'bg-danger',
-                    'accepted': 'bg-success'
-                }[new_status]
-                
                 return JsonResponse({
                     'success': True,
                     'message': _('Application status updated successfully.'),
                     'status': new_status,
-                    'status_display': status_display,
-                    'badge_class': badge_class
+                    'status_display': APPLICATION_STATUS_DISPLAY[new_status],
+                    'badge_class': APPLICATION_BADGE_CLASSES[new_status]
                 })
             
             messages.success(request, _('Application status updated successfully.'))
@@ -177,16 +199,13 @@ def posted_jobs(request):
         messages.warning(request, _('You do not have access to this page.'))
         return redirect('core:home')
     
-    jobs = Job.objects.filter(user=request.user).order_by('-created_at')
-    
-    # Get application statistics
-    total_applications = 0
-    application_stats = {}
+    jobs = Job.objects.filter(user=request.user).only(*JOB_LIST_FIELDS).annotate(
+        app_count=Count('applications')
+    ).order_by('-created_at')
     
-    for job in jobs:
-        job_applications = job.applications.count()
-        total_applications += job_applications
-        application_stats[job.id] = job_applications
+    # Get application statistics from the annotated counts
+    application_stats = {job.id: job.app_count for job in jobs}
+    total_applications = sum(application_stats.values())
     
     return render(request, 'dashboard/posted_jobs.html', {
         'jobs': jobs,
@@ -198,16 +217,13 @@ def posted_jobs(request):
 @staff_member_required
 def admin_dashboard(request):
     """Dashboard view for admins."""
-    # Get job statistics
-    total_jobs = Job.objects.count()
-    active_jobs = Job.objects.filter(is_active=True).count()
-    pending_approval = Job.objects.filter(is_active=True, is_approved=False).count()
-    approved_jobs = Job.objects.filter(is_active=True, is_approved=True).count()
-    
-    # Get application statistics
-    total_applications = Application.objects.count()
-    pending_applications = Application.objects.filter(status='pending').count()
-    accepted_applications = Application.objects.filter(status='accepted').count()
+    return _render_admin_dashboard(request)
+
+
+def _render_admin_dashboard(request):
+    """Render the admin dashboard; callers check staff access."""
+    # Job and application statistics come from cached counters kept current by signals
+    stats = get_dashboard_stats()
     
     # Get top employers
     top_employers = Job.objects.values('user__email', 'user__first_name', 'user__last_name', 'user__company_name') \
@@ -215,16 +231,17 @@ def admin_dashboard(request):
         .order_by('-job_count')[:5]
     
     # Recent jobs pending approval
-    pending_jobs = Job.objects.filter(is_active=True, is_approved=False).order_by('-created_at')[:10]
+    pending_jobs = Job.objects.filter(is_active=True, is_approved=False).select_related('user') \
+        .only(*JOB_LIST_FIELDS, 'user__email').order_by('-created_at')[:10]
     
     return render(request, 'dashboard/admin_dashboard.html', {
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs,
-        'pending_approval': pending_approval,
-        'approved_jobs': approved_jobs,
-        'total_applications': total_applications,
-        'pending_applications': pending_applications,
-        'accepted_applications': accepted_applications,
+        'total_jobs': stats['total_jobs'],
+        'active_jobs': stats['active_jobs'],
+        'pending_approval': stats['pending_approval'],
+        'approved_jobs': stats['approved_jobs'],
+        'total_applications': stats['total_applications'],
+        'pending_applications': stats['pending_applications'],
+        'accepted_applications': stats['accepted_applications'],
         'top_employers': top_employers,
         'pending_jobs': pending_jobs,
     })
@@ -237,24 +254,36 @@ def job_moderation(request):
     status = request.GET.get('status', 'pending')
     search_query = request.GET.get('q', '')
     
-    # Base queryset
+    # Base queryset, with the same status filter for the search index
+    search = JobDocument.search()
     if status == 'approved':
         jobs = Job.objects.filter(is_approved=True)
+        search = search.filter('term', is_approved=True)
     elif status == 'all':
         jobs = Job.objects.all()
     else:  # Default to pending
         jobs = Job.objects.filter(is_active=True, is_approved=False)
+        search = search.filter('term', is_active=True).filter('term', is_approved=False)
     
-    # Apply search if provided
-    if search_query:
-        jobs = jobs.filter(
-            Q(title__icontains=search_query) |
-            Q(company__icontains=search_query) |
-            Q(location__icontains=search_query) |
-            Q(user__email__icontains=search_query)
-        )
+    jobs = jobs.select_related('user').only(*JOB_LIST_FIELDS, 'user__email')
     
-    jobs = jobs.order_by('-created_at')
+    # Apply search if provided: Elasticsearch ranks the ids, the database loads the rows.
+    # The status filter runs in Elasticsearch too, so the limit only counts jobs on this tab.
+    if search_query:
+        search = search.query(
+            'multi_match',
+            query=search_query,
+            fields=['title^3', 'company', 'location', 'user.email'],
+        ).source(False)[:MODERATION_SEARCH_LIMIT]
+        ids = [int(hit.meta.id) for hit in search]
+        if ids:
+            jobs = jobs.filter(pk__in=ids).order_by(
+                Case(*(When(pk=pk, then=pos) for pos, pk in enumerate(ids)))
+            )
+        else:
+            jobs = jobs.none()
+    else:
+        jobs = jobs.order_by('-created_at')
     
     return render(request, 'dashboard/job_moderation.html', {
         'jobs': jobs,
@@ -266,18 +295,20 @@ def job_moderation(request):
 @staff_member_required
 def job_approval(request, job_id):
     """View to approve or reject a job."""
-    job = get_object_or_404(Job, id=job_id)
+    job = get_object_or_404(Job.objects.select_related('user'), id=job_id)
     
     if request.method == 'POST':
         action = request.POST.get('action')
         
         if action == 'approve':
             job.is_approved = True
-            job.save()
+            if job.tracker.has_changed('is_approved'):
+                job.save(update_fields=['is_approved', 'updated_at'])
             messages.success(request, _(f'Job "{job.title}" has been approved.'))
         elif action == 'reject':
             job.is_approved = False
-            job.save()
+            if job.tracker.has_changed('is_approved'):
+                job.save(update_fields=['is_approved', 'updated_at'])
             messages.success(request, _(f'Job "{job.title}" has been rejected.'))
         
         return redirect('dashboard:job_moderation')
@@ -290,7 +321,9 @@ def job_approval(request, job_id):
 @login_required
 def serve_resume(request, application_id):
     """Serve resume file with proper headers for preview."""
-    application = get_object_or_404(Application, id=application_id)
+    application = get_object_or_404(
+        Application.objects.select_related('job', 'job__user', 'user'), id=application_id
+    )
     
     # Check permission
     if request.user.is_seeker and application.user != request.user:
@@ -301,16 +334,13 @@ def serve_resume(request, application_id):
         messages.warning(request, _('You do not have access to this resume.'))
         return redirect('dashboard:posted_jobs')
     
-    # Get the file path
-    file_path = application.resume.path
-    
-    # Check if file exists
-    if not os.path.exists(file_path):
+    # Open once and let FileResponse set Content-Length/Type from the file itself;
+    # the open file lets the WSGI server use its sendfile fast path
+    try:
+        resume = open(application.resume.path, 'rb')
+    except FileNotFoundError:
         messages.error(request, _('Resume file not found.'))
         return redirect('dashboard:application_detail', application_id=application.id)
     
     # Serve the file with inline content disposition
-    response = FileResponse(open(file_path, 'rb'))
-    response['Content-Type'] = 'application/pdf'
-    response['Content-Disposition'] = 'inline; filename="{}"'.format(os.path.basename(file_path))
-    return response
+    return FileResponse(resume, as_attachment=False, filename=os.path.basename(resume.name))
@@ -112,6 +112,18 @@ DATABASES = {
 }
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/#using-argon2-with-django
+# Argon2id first; legacy PBKDF2 hashes are upgraded on the next successful login.
+
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -187,7 +199,7 @@ ADMINS = [('Admin', os.getenv('ADMIN_EMAIL', 'admin@jobportal.com'))]
 # REST framework + Simple JWT configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -199,12 +211,24 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': False,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.api.serializers.CachedTokenRefreshSerializer',
 }
 
+# Paths JWTAuthMiddleware passes through without looking at the access cookie
+JWT_MIDDLEWARE_SKIP_PREFIXES = (STATIC_URL, MEDIA_URL, '/favicon.ico')
+
+# Page-view activity logging: fraction of views recorded, and the window in
+# seconds within which repeat views of the same page by a user are dropped
+ACTIVITY_SAMPLE_RATE = float(os.getenv('ACTIVITY_SAMPLE_RATE', '0.1'))
+ACTIVITY_COALESCE_SECONDS = 30
+
 # Elasticsearch configuration
 ELASTICSEARCH_DSL = {
     'default': {
-        'hosts': os.getenv('ELASTICSEARCH_DSL_HOSTS', 'localhost:9200')
+        'hosts': os.getenv('ELASTICSEARCH_DSL_HOSTS', 'localhost:9200'),
+        # One pooled, compressed client per process, shared by every search
+        'http_compress': True,
+        'maxsize': 25,
     },
 }
 
@@ -287,12 +311,35 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Keep I/O-bound email, CPU-bound image work and housekeeping on separate
+# queues so each worker pool can be sized for its workload (see docker-compose.yml)
+CELERY_TASK_ROUTES = {
+    'core.tasks.send_email_async': {'queue': 'email'},
+    'core.tasks.send_emails_bulk_async': {'queue': 'email'},
+    'core.tasks.send_application_email_async': {'queue': 'email'},
+    'notifications.tasks.send_notification_async': {'queue': 'email'},
+    'core.tasks.generate_thumbnail_async': {'queue': 'images'},
+    'core.tasks.cleanup_expired_jobs': {'queue': 'maintenance'},
+    'core.tasks.update_job_status': {'queue': 'maintenance'},
+    'core.tasks.reindex_jobs_async': {'queue': 'maintenance'},
+    'notifications.tasks.clean_old_notifications_async': {'queue': 'maintenance'},
+}
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
 # Celery beat schedule
 CELERY_BEAT_SCHEDULE = {
     'cleanup_expired_jobs': {
-        'task': 'jobs.tasks.cleanup_expired_jobs',
+        'task': 'core.tasks.cleanup_expired_jobs',
         'schedule': crontab(hour=0, minute=0),  # Run daily at midnight
     },
+    'update_job_status': {
+        'task': 'core.tasks.update_job_status',
+        'schedule': crontab(minute=0),  # Run hourly
+    },
+    'clean_old_notifications': {
+        'task': 'notifications.tasks.clean_old_notifications_async',
+        'schedule': crontab(hour=1, minute=0),  # Run daily at 1 AM
+    },
 }
 
 # Rate limiting settings
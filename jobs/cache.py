@@ -0,0 +1,34 @@
+import time
+
+from django.core.cache import cache
+
+# Cache key patterns
+JOB_LIST_CACHE_KEY = 'job_list_page_{}'
+JOB_DETAIL_CACHE_KEY = 'job_detail_{}'
+
+# Version shared by every cached job list page; bumping it orphans them all at once
+JOB_LIST_VERSION_KEY = 'job_list_version'
+
+
+def get_job_list_version():
+    """Current version of the cached job list pages."""
+    version = cache.get(JOB_LIST_VERSION_KEY)
+    if version is None:
+        # Start from the clock so a lost counter never reuses an old version
+        cache.add(JOB_LIST_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(JOB_LIST_VERSION_KEY)
+    return version
+
+
+def invalidate_job_lists():
+    """Expire every cached job list page in O(1) by moving to a new version."""
+    try:
+        cache.incr(JOB_LIST_VERSION_KEY)
+    except ValueError:
+        cache.set(JOB_LIST_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_job(job_id):
+    """Drop the cached detail object for a job along with all cached list pages."""
+    cache.delete(JOB_DETAIL_CACHE_KEY.format(job_id))
+    invalidate_job_lists()
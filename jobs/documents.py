@@ -12,6 +12,10 @@ class JobDocument(Document):
         'email': fields.TextField(),
     })
     
+    # Exact values for term filters and the job type facet counts
+    job_type = fields.KeywordField()
+    salary = fields.KeywordField()
+    
     class Index:
         name = 'jobs'
         settings = {
@@ -28,17 +32,23 @@ class JobDocument(Document):
             'description',
             'requirements',
             'location',
-            'job_type',
-            'salary',
             'is_active',
             'is_approved',
             'created_at',
             'updated_at',
         ]
+        # Every job is indexed, including pending ones, so that moderation
+        # can search them; public searches filter on is_active/is_approved.
         
-        # Only index active and approved jobs
-        def get_queryset(self):
-            return self.django.model.objects.filter(
-                is_active=True,
-                is_approved=True
-            )
+        # Rows fetched per database round-trip and documents per bulk request
+        queryset_pagination = 2000
+    
+    def get_queryset(self):
+        """Return the jobs to index with their user joined in."""
+        return super().get_queryset().select_related('user')
+    
+    def get_indexing_queryset(self):
+        """Stream the indexed columns in chunks instead of loading whole rows."""
+        return self.get_queryset().only(
+            *self.Django.fields, 'user__id', 'user__username', 'user__email',
+        ).iterator(chunk_size=self.django.queryset_pagination)
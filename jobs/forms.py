@@ -60,6 +60,7 @@ class JobSearchForm(forms.Form):
     """Form for searching jobs."""
     keyword = forms.CharField(
         required=False,
+        help_text=_('Keyword searches show the 1,000 most recent matching jobs.'),
         widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Job title, company, or keywords'})
     )
     location = forms.CharField(
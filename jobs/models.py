@@ -52,6 +52,11 @@ class Job(models.Model):
         ('freelance', _('Freelance')),
     )
     
+    STATUS_CHOICES = (
+        ('active', _('Active')),
+        ('expired', _('Expired')),
+    )
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posted_jobs')
     title = models.CharField(max_length=100)
     company = models.CharField(max_length=100)
@@ -62,6 +67,8 @@ class Job(models.Model):
     salary = models.CharField(max_length=20, choices=SALARY_CHOICES, default='negotiable')
     is_active = models.BooleanField(default=True)
     is_approved = models.BooleanField(default=False, help_text=_('Job must be approved by admin before it is visible to job seekers'))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    expiry_date = models.DateTimeField(blank=True, null=True, help_text=_('The job is marked as expired after this date'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -73,6 +80,19 @@ class Job(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Employer job lists and the public/moderation listings
+            models.Index(fields=['user', '-created_at'], name='job_user_created_idx'),
+            # Trailing id lets keyset pagination seek on (created_at, id)
+            models.Index(fields=['is_active', 'is_approved', '-created_at', '-id'], name='job_visible_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='job_created_id_idx'),
+            # Job type and salary filters on the public lists
+            models.Index(fields=['job_type', '-created_at', '-id'], name='job_type_created_idx'),
+            models.Index(fields=['salary', '-created_at', '-id'], name='job_salary_created_idx'),
+            # Periodic expiry and cleanup tasks
+            models.Index(fields=['status', 'expiry_date'], name='job_status_expiry_idx'),
+            models.Index(fields=['status', 'created_at'], name='job_status_created_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -102,12 +122,18 @@ class Application(models.Model):
     # Field tracker for monitoring changes
     tracker = FieldTracker()
     
-    # Field tracker for monitoring changes
-    tracker = FieldTracker()
-    
     class Meta:
-        unique_together = ('job', 'user')
         ordering = ['-applied_at']
+        constraints = [
+            # One application per seeker and job; lets applying use a single get_or_create
+            models.UniqueConstraint(fields=['job', 'user'], name='uniq_job_user'),
+        ]
+        indexes = [
+            # Seeker application lists and per-status dashboard counts
+            models.Index(fields=['user', '-applied_at'], name='app_user_applied_idx'),
+            models.Index(fields=['job', 'status'], name='app_job_status_idx'),
+            models.Index(fields=['status'], name='app_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} applied to {self.job.title}"
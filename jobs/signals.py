@@ -1,23 +1,69 @@
-from django.db.models.signals import post_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from .cache import invalidate_job
 from .models import Job, Application
-from notifications.utils import notify_job_application, notify_job_status_update, notify_job_approval_status
+from notifications.models import UserActivity
+from notifications.utils import (
+    queue_notification, notify_job_application, notify_application_status_update, notify_job_status_update
+)
 
-@receiver(post_save, sender=Job)
+# The only post_save receivers for Job and Application; each save logs and notifies once
+@receiver(post_save, sender=Job, dispatch_uid='jobs.job_post_save')
 def job_post_save(sender, instance, created, **kwargs):
-    """Handle notifications when a job is saved"""
-    if not created and hasattr(instance, 'tracker'):
-        # Check if is_approved status changed
-        if instance.tracker.has_changed('is_approved'):
-            notify_job_approval_status(instance, instance.is_approved)
+    """Log job creation and notify the employer when a job is posted or reviewed"""
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'is_approved' not in update_fields:
+        # A partial save that cannot have touched the approval flag
+        return
+
+    if created:
+        UserActivity.objects.create(
+            user=instance.user,
+            action='create',
+            action_details=f'Created job posting: {instance.title}',
+            ip_address='system',  # Since this is a system event
+            user_agent='system'
+        )
+
+        queue_notification(
+            user=instance.user,
+            title='Job Posted Successfully',
+            message=f'Your job posting "{instance.title}" has been created and is pending approval.',
+            notification_type='success',
+            template='emails/job_approval_notification.html',
+            job=instance,
+            status='pending',
+            status_class='warning'
+        )
+    elif instance.tracker.has_changed('is_approved'):
+        notify_job_status_update(instance, instance.is_approved)
 
-@receiver(post_save, sender=Application)
+@receiver(post_save, sender=Job, dispatch_uid='jobs.invalidate_job_cache_on_save')
+@receiver(post_delete, sender=Job, dispatch_uid='jobs.invalidate_job_cache_on_delete')
+def invalidate_job_cache(sender, instance, **kwargs):
+    """Expire the cached job detail and list pages once the change commits"""
+    transaction.on_commit(partial(invalidate_job, instance.pk))
+
+@receiver(post_save, sender=Application, dispatch_uid='jobs.job_application_post_save')
 def job_application_post_save(sender, instance, created, **kwargs):
-    """Handle notifications when a job application is saved"""
+    """Log new applications and notify both sides when one is submitted or its status changes"""
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'status' not in update_fields:
+        return
+
     if created:
-        # New application
+        UserActivity.objects.create(
+            user=instance.user,
+            action='create',
+            action_details=f'Applied for job: {instance.job.title}',
+            ip_address='system',
+            user_agent='system'
+        )
+
+        # Notifies the employer and the applicant
         notify_job_application(instance)
-    elif hasattr(instance, 'tracker'):
-        # Status update
-        if instance.tracker.has_changed('status'):
-            notify_job_status_update(instance, instance.status)
+    elif instance.tracker.has_changed('status'):
+        notify_application_status_update(instance)
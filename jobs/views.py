@@ -1,25 +1,99 @@
+import hashlib
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.contrib import messages
-from django.db.models import Q
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Q, Exists, OuterRef
 from django.utils.translation import gettext_lazy as _
+from django.utils import timezone
+from django.core.paginator import Paginator, Page
+from django.http import Http404
 from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
 from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
 from django_ratelimit.decorators import ratelimit
 from django.core.cache import cache
 from django.conf import settings
 
+from core.pagination import CursorPage, decode_cursor, paginate_by_cursor
+from .cache import JOB_LIST_CACHE_KEY, JOB_DETAIL_CACHE_KEY, get_job_list_version
 from .models import Job, Application
 from .forms import JobForm, ApplicationForm, JobSearchForm
 from elasticsearch_dsl import Q as ESQ
 from .documents import JobDocument
 
-# Cache key patterns
-JOB_LIST_CACHE_KEY = 'job_list_page_{}'
-JOB_DETAIL_CACHE_KEY = 'job_detail_{}'
+# Most keyword matches the list views take from Elasticsearch; the newest are kept
+KEYWORD_MATCH_LIMIT = 1000
+
+# Jobs shown per list page
+JOBS_PER_PAGE = 10
+
+# Elasticsearch's default index.max_result_window: from + size may not go past it
+SEARCH_RESULT_WINDOW = 10000
+
+# Columns the job list templates render; skips the long description/requirements text
+JOB_LIST_FIELDS = (
+    'id', 'title', 'company', 'location', 'job_type', 'salary',
+    'is_active', 'is_approved', 'created_at',
+)
+
+# Query parameters that change a job list page; anything else (utm_*, etc.) shares its cache entry
+JOB_LIST_CACHE_PARAMS = ('keyword', 'location', 'job_type', 'salary', 'date_posted', 'after')
+
+# Public job search shared by every request: visibility filters, job type facet and sort.
+# Built once; each request's query and filters are added to a clone of it.
+_BASE_JOB_SEARCH = (
+    JobDocument.search()
+    .filter('term', is_active=True)
+    .filter('term', is_approved=True)
+    .sort('-created_at')
+)
+_BASE_JOB_SEARCH.aggs.bucket('by_type', 'terms', field='job_type')
+
+
+def _keyword_job_ids(keyword, job_type=None, salary=None, posted_since=None):
+    """
+    Ids of visible jobs whose title, company or description match ``keyword``, from the search index.
+    
+    The exact filters run in Elasticsearch too, so KEYWORD_MATCH_LIMIT applies to the
+    filtered matches and, with newest-first order, only drops the oldest of them.
+    """
+    search = JobDocument.search().filter('term', is_active=True).filter('term', is_approved=True)
+    if job_type:
+        search = search.filter('term', job_type=job_type)
+    if salary:
+        search = search.filter('term', salary=salary)
+    if posted_since:
+        search = search.filter('range', created_at={'gte': posted_since})
+    search = search.query(
+        'multi_match', query=keyword, fields=['title', 'company', 'description'],
+    ).sort('-created_at').source(False)[:KEYWORD_MATCH_LIMIT]
+    return [int(hit.meta.id) for hit in search]
+
+
+def _visible_jobs_q(user):
+    """Filter for the jobs ``user`` may view in detail."""
+    if user.is_authenticated:
+        if user.is_employer:
+            # Employers can see their own jobs even if not approved
+            return Q(is_active=True, is_approved=True) | Q(user=user)
+        if user.is_staff:
+            # Staff can see all jobs
+            return Q()
+    # Everyone else can only see approved jobs
+    return Q(is_active=True, is_approved=True)
+
+
+def _annotate_has_applied(queryset, user):
+    """Annotate ``user_has_applied`` onto jobs for job seekers, in the same query."""
+    if user.is_authenticated and user.is_seeker:
+        return queryset.annotate(user_has_applied=Exists(
+            Application.objects.filter(job=OuterRef('pk'), user=user)
+        ))
+    return queryset
 
 
 class EmployerRequiredMixin(UserPassesTestMixin):
@@ -41,56 +115,81 @@ class JobListView(ListView):
     model = Job
     template_name = 'jobs/job_list.html'
     context_object_name = 'jobs'
-    paginate_by = 10
+    paginate_by = JOBS_PER_PAGE
     
-    def get_queryset(self):
-        """Return filtered jobs based on search criteria with caching."""
-        # Create a cache key based on the search parameters
+    def paginate_queryset(self, queryset, page_size):
+        """Keyset-paginate on (created_at, id), caching each page's job ids rather than rows."""
+        cursor = self.request.GET.get('after', '')
         cache_key = self._get_cache_key()
-        queryset = cache.get(cache_key)
+        # Job saves and deletes bump the version (see jobs.signals)
+        version = get_job_list_version()
+        cached = cache.get(cache_key, version=version)
         
-        if queryset is None:
-            queryset = Job.objects.approved()
-            
-            # Get search parameters from GET request
-            keyword = self.request.GET.get('keyword', '')
-            location = self.request.GET.get('location', '')
-            job_type = self.request.GET.get('job_type', '')
-            salary = self.request.GET.get('salary', '')
-            date_posted = self.request.GET.get('date_posted', '')
-            
-            # Apply filters if provided
-            if keyword:
-                queryset = queryset.filter(
-                    Q(title__icontains=keyword) | 
-                    Q(company__icontains=keyword) | 
-                    Q(description__icontains=keyword)
-                )
-            
-            # Cache the results for 15 minutes
-            cache.set(cache_key, queryset, settings.CACHE_TTL)
+        if cached is None:
+            page = paginate_by_cursor(self._filter_by_keyword(queryset), cursor, page_size)
+            # Plain ids and the cursor pickle small and are valid in every worker
+            cache.set(cache_key, ([job.pk for job in page], page.next_cursor), settings.CACHE_TTL, version=version)
+        else:
+            ids, next_cursor = cached
+            jobs_by_id = Job.objects.only(*JOB_LIST_FIELDS).in_bulk(ids)
+            object_list = [jobs_by_id[pk] for pk in ids if pk in jobs_by_id]
+            # The keyword search only runs if something asks the page for its total count
+            filtered = SimpleLazyObject(lambda: self._filter_by_keyword(queryset))
+            page = CursorPage(filtered, object_list, next_cursor, bool(decode_cursor(cursor)))
+        
+        return None, page, page.object_list, page.has_other_pages()
+    
+    def get_context_data(self, **kwargs):
+        """Expose the page as ``jobs`` so templates can render its navigation."""
+        context = super().get_context_data(**kwargs)
+        context['jobs'] = context['page_obj']
+        return context
+    
+    def get_queryset(self):
+        """Return filtered jobs based on search criteria."""
+        queryset = Job.objects.approved().only(*JOB_LIST_FIELDS)
+        
+        # Get search parameters from GET request
+        location = self.request.GET.get('location', '')
+        job_type = self.request.GET.get('job_type', '')
+        salary = self.request.GET.get('salary', '')
+        date_posted = self.request.GET.get('date_posted', '')
         
         return queryset
     
+    def _filter_by_keyword(self, queryset):
+        """Narrow ``queryset`` to the keyword's matches; left out of get_queryset so cached pages skip the search."""
+        keyword = self.request.GET.get('keyword', '')
+        if keyword:
+            queryset = queryset.filter(pk__in=_keyword_job_ids(keyword))
+        return queryset
+    
     def _get_cache_key(self):
-        """Generate a cache key based on the current request parameters."""
-        params = []
-        for key in sorted(self.request.GET.keys()):
-            params.append(f"{key}:{self.request.GET[key]}")
-        return f"job_list_{'_'.join(params)}"
+        """Generate a short cache key from a hash of the parameters that affect the page."""
+        params = '&'.join(f"{key}={self.request.GET.get(key, '')}" for key in JOB_LIST_CACHE_PARAMS)
+        return JOB_LIST_CACHE_KEY.format(hashlib.blake2b(params.encode(), digest_size=16).hexdigest())
 
 
 @method_decorator(cache_page(settings.CACHE_TTL), name='dispatch')
 @method_decorator(ratelimit(key='ip', rate='1000/h', method=['GET']), name='dispatch')
+# What a user may see depends on who they are, so cached pages are kept per cookie
+@method_decorator(vary_on_cookie, name='dispatch')
 class JobDetailView(DetailView):
     """View for displaying job details."""
     model = Job
     template_name = 'jobs/job_detail.html'
     context_object_name = 'job'
+    pk_url_kwarg = 'job_id'
     
     def get_object(self):
         """Get job object with caching."""
-        job_id = self.kwargs.get('pk')
+        user = self.request.user
+        if user.is_authenticated and (user.is_seeker or user.is_employer or user.is_staff):
+            # Only the public view of a job is shared through the cache: seekers get a
+            # per-user annotation and employers/staff may see unapproved jobs
+            return super().get_object()
+        
+        job_id = self.kwargs.get(self.pk_url_kwarg)
         cache_key = JOB_DETAIL_CACHE_KEY.format(job_id)
         job = cache.get(cache_key)
         
@@ -102,18 +201,8 @@ class JobDetailView(DetailView):
     
     def get_queryset(self):
         """Return approved jobs or jobs owned by current user."""
-        if self.request.user.is_authenticated and self.request.user.is_employer:
-            # Employers can see their own jobs even if not approved
-            return Job.objects.filter(
-                Q(is_active=True, is_approved=True) | 
-                Q(user=self.request.user)
-            )
-        elif self.request.user.is_authenticated and self.request.user.is_staff:
-            # Staff can see all jobs
-            return Job.objects.all()
-        else:
-            # Regular users can only see approved jobs
-            return Job.objects.filter(is_active=True, is_approved=True)
+        queryset = Job.objects.filter(_visible_jobs_q(self.request.user)).select_related('user')
+        return _annotate_has_applied(queryset, self.request.user)
     
     def get_context_data(self, **kwargs):
         """Add application form to context for job seekers."""
@@ -121,11 +210,8 @@ class JobDetailView(DetailView):
         
         # Add application form for job seekers who haven't applied yet
         if self.request.user.is_authenticated and self.request.user.is_seeker:
-            # Check if user has already applied
-            has_applied = Application.objects.filter(
-                job=self.object,
-                user=self.request.user
-            ).exists()
+            # Annotated by get_queryset
+            has_applied = self.object.user_has_applied
             
             if not has_applied:
                 context['application_form'] = ApplicationForm()
@@ -192,7 +278,7 @@ class JobDeleteView(LoginRequiredMixin, EmployerRequiredMixin, DeleteView):
 
 def job_list(request):
     """Function-based view for job listings with pagination handling."""
-    jobs_list = Job.objects.approved()
+    jobs_list = Job.objects.approved().only(*JOB_LIST_FIELDS)
     search_form = JobSearchForm(request.GET or None)
     
     # Apply search filters if form is valid
@@ -203,12 +289,14 @@ def job_list(request):
         salary = search_form.cleaned_data.get('salary')
         date_posted = search_form.cleaned_data.get('date_posted')
         
+        date_threshold = None
+        if date_posted:
+            from datetime import timedelta
+            days = int(date_posted)
+            date_threshold = timezone.now() - timedelta(days=days)
+        
         if keyword:
-            jobs_list = jobs_list.filter(
-                Q(title__icontains=keyword) | 
-                Q(company__icontains=keyword) | 
-                Q(description__icontains=keyword)
-            )
+            jobs_list = jobs_list.filter(pk__in=_keyword_job_ids(keyword, job_type, salary, date_threshold))
         
         if location:
             jobs_list = jobs_list.filter(location__icontains=location)
@@ -219,24 +307,11 @@ def job_list(request):
         if salary:
             jobs_list = jobs_list.filter(salary=salary)
         
-        if date_posted:
-            from datetime import datetime, timedelta
-            days = int(date_posted)
-            date_threshold = datetime.now() - timedelta(days=days)
+        if date_threshold:
             jobs_list = jobs_list.filter(created_at__gte=date_threshold)
     
-    # Pagination
-    paginator = Paginator(jobs_list, 10)
-    page = request.GET.get('page')
-    
-    try:
-        jobs = paginator.page(page)
-    except PageNotAnInteger:
-        # If page is not an integer, deliver first page
-        jobs = paginator.page(1)
-    except EmptyPage:
-        # If page is out of range, deliver last page of results
-        jobs = paginator.page(paginator.num_pages)
+    # Keyset pagination: each page seeks past the previous page's last job
+    jobs = paginate_by_cursor(jobs_list, request.GET.get('after', ''), JOBS_PER_PAGE)
     
     return render(request, 'jobs/job_list.html', {
         'jobs': jobs,
@@ -246,48 +321,31 @@ def job_list(request):
 
 def job_detail(request, job_id):
     """Function-based view for job details."""
-    # Different queryset based on user role
-    if request.user.is_authenticated:
-        if request.user.is_employer:
-            # Employers can see their own jobs even if not approved
-            job_queryset = Job.objects.filter(
-                Q(is_active=True, is_approved=True) | Q(user=request.user)
-            )
-        elif request.user.is_staff:
-            # Staff can see all jobs
-            job_queryset = Job.objects.all()
-        else:
-            # Job seekers can only see approved jobs
-            job_queryset = Job.objects.filter(is_active=True, is_approved=True)
-    else:
-        # Anonymous users can only see approved jobs
-        job_queryset = Job.objects.filter(is_active=True, is_approved=True)
-    
-    job = get_object_or_404(job_queryset, id=job_id)
+    job_queryset = Job.objects.filter(_visible_jobs_q(request.user)).select_related('user')
+    job = get_object_or_404(_annotate_has_applied(job_queryset, request.user), id=job_id)
     
     has_applied = False
     application_form = None
     
     # Check if user is authenticated and is a job seeker
     if request.user.is_authenticated and request.user.is_seeker:
-        # Check if user has already applied
-        has_applied = Application.objects.filter(
-            job=job,
-            user=request.user
-        ).exists()
+        # Annotated onto the job above
+        has_applied = job.user_has_applied
         
         # Create application form if not applied
         if not has_applied:
             if request.method == 'POST':
                 application_form = ApplicationForm(request.POST, request.FILES)
                 if application_form.is_valid():
-                    application = application_form.save(commit=False)
-                    application.job = job
-                    application.user = request.user
-                    application.save()
+                    application, created = Application.objects.get_or_create(
+                        job=job, user=request.user, defaults=application_form.cleaned_data
+                    )
+                    if not created:
+                        messages.info(request, _('You have already applied for this job.'))
+                        return redirect('jobs:job_detail', job_id=job.id)
                     
-                    from core.utils import send_application_notification_email
-                    send_application_notification_email(application)
+                    from core.utils import queue_application_notification_email
+                    queue_application_notification_email(application)
                     
                     messages.success(request, _('Application submitted successfully!'))
                     return redirect('jobs:job_detail', job_id=job.id)
@@ -313,24 +371,25 @@ def apply_job(request, job_id):
     
     job = get_object_or_404(Job, id=job_id, is_active=True)
     
-    # Check if already applied
-    if Application.objects.filter(job=job, user=request.user).exists():
-        messages.info(request, _('You have already applied for this job.'))
-        return redirect('jobs:job_detail', job_id=job.id)
-    
     if request.method == 'POST':
         form = ApplicationForm(request.POST, request.FILES)
         if form.is_valid():
-            application = form.save(commit=False)
-            application.job = job
-            application.user = request.user
-            application.save()
+            # The unique constraint makes this a race-free "already applied" check
+            application, created = Application.objects.get_or_create(
+                job=job, user=request.user, defaults=form.cleaned_data
+            )
+            if not created:
+                messages.info(request, _('You have already applied for this job.'))
+                return redirect('jobs:job_detail', job_id=job.id)
             
-            from core.utils import send_application_notification_email
-            send_application_notification_email(application)
+            from core.utils import queue_application_notification_email
+            queue_application_notification_email(application)
             
             messages.success(request, _('Application submitted successfully!'))
             return redirect('jobs:job_detail', job_id=job.id)
+    elif Application.objects.filter(job=job, user=request.user).exists():
+        messages.info(request, _('You have already applied for this job.'))
+        return redirect('jobs:job_detail', job_id=job.id)
     else:
         form = ApplicationForm()
     
@@ -402,7 +461,7 @@ def delete_job(request, job_id):
 
 def search_jobs(request):
     """View for searching jobs."""
-    jobs = Job.objects.approved()
+    jobs = Job.objects.approved().only(*JOB_LIST_FIELDS)
     search_form = JobSearchForm(request.GET or None)
     
     if search_form.is_valid():
@@ -412,12 +471,16 @@ def search_jobs(request):
         salary = search_form.cleaned_data.get('salary')
         date_posted = search_form.cleaned_data.get('date_posted')
         
+        date_threshold = None
+        if date_posted:
+            from datetime import timedelta
+            days = int(date_posted)
+            # Whole minutes keep the query text, and so the cached count, stable between requests
+            now = timezone.now().replace(second=0, microsecond=0)
+            date_threshold = now - timedelta(days=days)
+        
         if keyword:
-            jobs = jobs.filter(
-                Q(title__icontains=keyword) | 
-                Q(company__icontains=keyword) | 
-                Q(description__icontains=keyword)
-            )
+            jobs = jobs.filter(pk__in=_keyword_job_ids(keyword, job_type, salary, date_threshold))
         
         if location:
             jobs = jobs.filter(location__icontains=location)
@@ -428,22 +491,11 @@ def search_jobs(request):
         if salary:
             jobs = jobs.filter(salary=salary)
         
-        if date_posted:
-            from datetime import datetime, timedelta
-            days = int(date_posted)
-            date_threshold = datetime.now() - timedelta(days=days)
+        if date_threshold:
             jobs = jobs.filter(created_at__gte=date_threshold)
     
-    # Pagination
-    paginator = Paginator(jobs, 10)
-    page = request.GET.get('page')
-    
-    try:
-        jobs = paginator.page(page)
-    except PageNotAnInteger:
-        jobs = paginator.page(1)
-    except EmptyPage:
-        jobs = paginator.page(paginator.num_pages)
+    # Keyset pagination: each page seeks past the previous page's last job
+    jobs = paginate_by_cursor(jobs, request.GET.get('after', ''), JOBS_PER_PAGE)
     
     return render(request, 'jobs/search_results.html', {
         'jobs': jobs,
@@ -456,16 +508,17 @@ class JobSearchView(ListView):
     model = Job
     template_name = 'jobs/job_search.html'
     context_object_name = 'jobs'
-    paginate_by = 10
+    paginate_by = JOBS_PER_PAGE
     
     def get_queryset(self):
-        """Return search results from Elasticsearch."""
+        """Return the (unexecuted) Elasticsearch search for the current filters."""
         query = self.request.GET.get('q', '')
         location = self.request.GET.get('location', '')
         job_type = self.request.GET.get('job_type', '')
         
-        # Base search query
-        search = JobDocument.search()
+        # Pending jobs are indexed for moderation but never public. Without a text
+        # query the search is filters only, which Elasticsearch can answer from its filter cache.
+        search = _BASE_JOB_SEARCH
         
         if query:
             # Multi-match query across multiple fields
@@ -480,19 +533,48 @@ class JobSearchView(ListView):
         # Add filters
         if location:
             search = search.filter('match', location=location)
+        # The job type filter is a post_filter so the by_type counts still cover the other types
         if job_type:
-            search = search.filter('term', job_type=job_type)
+            search = search.post_filter('term', job_type=job_type)
         
-        # Add sorting
-        search = search.sort('-created_at')
+        return search
+    
+    def paginate_queryset(self, search, page_size):
+        """Let Elasticsearch paginate with from/size and load the page's jobs by id."""
+        try:
+            page_number = max(int(self.request.GET.get('page', 1)), 1)
+        except ValueError:
+            page_number = 1
+        # Pages past the result window would make Elasticsearch reject the request
+        if page_number > SEARCH_RESULT_WINDOW // page_size:
+            raise Http404(_('Invalid page.'))
+        start = (page_number - 1) * page_size
         
-        # Execute search
-        response = search.execute()
+        # Only ids come back from Elasticsearch; the rows are one primary key lookup
+        response = search[start:start + page_size].source(False).execute()
         
-        return response
-
+        # The hit total sizes the paginator without a separate count request,
+        # capped so the page links stay inside the result window
+        paginator = Paginator(range(min(response.hits.total.value, SEARCH_RESULT_WINDOW)), page_size)
+        if page_number > paginator.num_pages:
+            raise Http404(_('Invalid page.'))
+        
+        ids = [int(hit.meta.id) for hit in response]
+        jobs_by_id = Job.objects.only(*JOB_LIST_FIELDS, 'description').in_bulk(ids)
+        object_list = [jobs_by_id[pk] for pk in ids if pk in jobs_by_id]
+        page = Page(object_list, page_number, paginator)
+        self.job_type_counts = {
+            bucket.key: bucket.doc_count for bucket in response.aggregations.by_type.buckets
+        }
+        return paginator, page, object_list, page.has_other_pages()
+    
     def get_context_data(self, **kwargs):
         """Add search form to context."""
         context = super().get_context_data(**kwargs)
+        context['jobs'] = context['page_obj']
         context['search_form'] = JobSearchForm(self.request.GET)
+        context['job_type_facets'] = [
+            (value, label, self.job_type_counts.get(value, 0))
+            for value, label in Job.JOB_TYPE_CHOICES
+        ]
         return context
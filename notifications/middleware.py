@@ -1,30 +1,130 @@
+import atexit
+import logging
+import os
+import random
 import threading
+import time
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.db import close_old_connections
 from django.utils.deprecation import MiddlewareMixin
 from .models import UserActivity
 
+logger = logging.getLogger(__name__)
+
 # Thread local storage
 _thread_locals = threading.local()
 
+# Paths whose requests are never recorded as page views
+SKIP_PREFIXES = ('/static/', '/media/', '/favicon.ico', '/admin/jsi18n/')
+
+# Seconds between background flushes of buffered page views
+ACTIVITY_FLUSH_INTERVAL = 2
+
+# Flush early once this many page views are buffered; also the INSERT batch size
+ACTIVITY_BATCH_SIZE = 500
+
+# Page views waiting to be written; deque appends and pops are thread-safe
+_activity_buffer = deque()
+_flush_lock = threading.Lock()
+_flush_wakeup = threading.Event()
+_flusher_pid = None
+
+# Most recent (path, time) viewed per user, least recently active users evicted first
+ACTIVITY_RECENT_USERS = 10000
+_last_views = OrderedDict()
+_last_views_lock = threading.Lock()
+
+
 def get_current_request():
     """Returns the current request object for this thread"""
     return getattr(_thread_locals, 'request', None)
 
+
+def flush_activity_buffer():
+    """Write all buffered page views with batched INSERTs."""
+    with _flush_lock:
+        activities = []
+        while _activity_buffer:
+            activities.append(_activity_buffer.popleft())
+        if activities:
+            UserActivity.objects.bulk_create(
+                activities, batch_size=ACTIVITY_BATCH_SIZE, ignore_conflicts=True
+            )
+
+
+def _flush_forever():
+    """Background loop that flushes the buffer every interval or when it fills up."""
+    while True:
+        _flush_wakeup.wait(ACTIVITY_FLUSH_INTERVAL)
+        _flush_wakeup.clear()
+        try:
+            flush_activity_buffer()
+        except Exception:
+            logger.exception("failed to write buffered user activity")
+        finally:
+            close_old_connections()
+
+
+def _ensure_flusher():
+    """Start the flusher thread once per process (worker processes may be forked)."""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _flush_lock:
+        if _flusher_pid != os.getpid():
+            threading.Thread(target=_flush_forever, name='activity-flusher', daemon=True).start()
+            _flusher_pid = os.getpid()
+
+
+def record_activity(activity):
+    """Queue an unsaved UserActivity for the next background flush."""
+    _ensure_flusher()
+    _activity_buffer.append(activity)
+    if len(_activity_buffer) >= ACTIVITY_BATCH_SIZE:
+        _flush_wakeup.set()
+
+
+def is_repeat_view(user_id, path):
+    """Whether ``user_id`` already viewed ``path`` within the coalescing window."""
+    now = time.monotonic()
+    with _last_views_lock:
+        last = _last_views.pop(user_id, None)
+        _last_views[user_id] = (path, now)
+        if len(_last_views) > ACTIVITY_RECENT_USERS:
+            _last_views.popitem(last=False)
+    return last is not None and last[0] == path and now - last[1] < settings.ACTIVITY_COALESCE_SECONDS
+
+
+# Don't lose the last few page views on a clean shutdown
+atexit.register(flush_activity_buffer)
+
+
 class UserActivityMiddleware(MiddlewareMixin):
     def process_request(self, request):
         """Store request in thread local storage"""
         _thread_locals.request = request
         
+        # Skip certain paths where we don't want to track activity
+        if request.path.startswith(SKIP_PREFIXES):
+            return
+        
         if request.user.is_authenticated:
-            # Skip certain paths where we don't want to track activity
-            skip_paths = ['/static/', '/media/', '/favicon.ico', '/admin/jsi18n/']
-            if not any(path in request.path for path in skip_paths) and not request.path.startswith('/admin/jsi18n/'):
-                UserActivity.objects.create(
-                    user=request.user,
-                    action='view',
-                    action_details=f'Viewed page: {request.path}',
-                    ip_address=self.get_client_ip(request),
-                    user_agent=request.META.get('HTTP_USER_AGENT', '')
-                )
+            # Coalesce reloads/polls of the same page, then keep only a sample of views
+            if is_repeat_view(request.user.pk, request.path):
+                return
+            if random.random() >= settings.ACTIVITY_SAMPLE_RATE:
+                return
+            
+            # Buffered and written in batches instead of one INSERT per request
+            record_activity(UserActivity(
+                user_id=request.user.pk,
+                action='view',
+                action_details=f'Viewed page: {request.path}',
+                ip_address=self.get_client_ip(request),
+                user_agent=request.META.get('HTTP_USER_AGENT', '')
+            ))
 
     def process_response(self, request, response):
         """Clear thread local storage"""
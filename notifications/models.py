@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 
 class Notification(models.Model):
@@ -13,7 +14,8 @@ class Notification(models.Model):
         ('application_status', 'Application Status'),
     )
 
-    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Lookups by recipient use notif_recipient_created_idx, which leads with this column
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)
     title = models.CharField(max_length=255)
     message = models.TextField()
     notification_type = models.CharField(max_length=60, choices=NOTIFICATION_TYPES, default='info')
@@ -22,6 +24,12 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of a user's notifications, newest first
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notif_recipient_created_idx'),
+            # Partial index covering only unread rows, for mark-all-read and unread counts
+            models.Index(fields=['recipient'], condition=Q(is_read=False), name='notif_unread_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.recipient.username}"
@@ -41,7 +49,8 @@ class UserActivity(models.Model):
     action_details = models.TextField(blank=True, null=True)
     ip_address = models.GenericIPAddressField()
     user_agent = models.TextField()
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Indexed for the default newest-first ordering and admin date filtering
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
     
     class Meta:
         verbose_name_plural = 'User Activities'
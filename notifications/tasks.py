@@ -0,0 +1,32 @@
+from celery import shared_task
+from accounts.models import User
+from jobs.models import Job, Application
+
+
+@shared_task
+def send_notification_async(user_id, title, message, notification_type='info',
+                            job_id=None, application_id=None, applicant_id=None, **kwargs):
+    """Create and email a notification in the worker; model arguments arrive as ids."""
+    from .utils import send_notification
+
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+
+    # Rebuild the model instances the email templates expect
+    if job_id is not None:
+        kwargs['job'] = Job.objects.select_related('user').filter(pk=job_id).first()
+    if application_id is not None:
+        kwargs['application'] = Application.objects.select_related('job', 'user').filter(pk=application_id).first()
+    if applicant_id is not None:
+        kwargs['applicant'] = User.objects.filter(pk=applicant_id).first()
+
+    send_notification(user, title, message, notification_type, **kwargs)
+
+
+@shared_task
+def clean_old_notifications_async(days=30):
+    """Periodically remove read notifications older than ``days``."""
+    from .utils import clean_old_notifications
+
+    clean_old_notifications(days)
@@ -1,50 +1,107 @@
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+import hashlib
+from functools import lru_cache, partial
+
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 from django.contrib.sites.shortcuts import get_current_site
 from django.utils.html import strip_tags
 from notifications.models import Notification
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 from datetime import timedelta
+from core.utils import get_email_template, get_plain_text_template, queue_email, queue_emails
+from .tasks import send_notification_async
+
+# Absolute URL prefix for links in notifications; settings do not change at runtime
+SITE_URL = settings.SITE_URL
+
+# Email status context for job approval/rejection notifications
+JOB_REVIEW_STATUS_CONTEXT = {
+    'job_approved': {'status': 'approved', 'status_display': 'Approved', 'status_class': 'success'},
+    'job_rejected': {'status': 'rejected', 'status_display': 'Rejected', 'status_class': 'danger'},
+}
+
+# Email labels and badge classes for application statuses
+APPLICATION_STATUS_DISPLAY = {
+    'pending': 'Pending Review',
+    'reviewing': 'Under Review',
+    'shortlisted': 'Shortlisted',
+    'accepted': 'Accepted',
+    'rejected': 'Rejected'
+}
+APPLICATION_STATUS_CLASSES = {
+    'pending': 'warning',
+    'reviewing': 'info',
+    'shortlisted': 'info',
+    'accepted': 'success',
+    'rejected': 'danger'
+}
+
+# In-app messages for application status changes; other statuses get a generic message
+APPLICATION_STATUS_MESSAGES = {
+    'reviewing': 'Your application for "{title}" is currently under review.',
+    'shortlisted': 'Congratulations! Your application for "{title}" has been shortlisted.',
+    'rejected': 'Unfortunately, your application for "{title}" was not selected.',
+    'accepted': 'Congratulations! Your application for "{title}" has been accepted.',
+}
+
+# Rendered job review emails are cached briefly, keyed by a hash of what they depend on
+NOTIFICATION_HTML_CACHE_KEY = 'notification_html_{}'
+NOTIFICATION_HTML_CACHE_TTL = 300
+
+# In-app notification rows inserted per statement by send_notifications_bulk
+NOTIFICATION_BATCH_SIZE = 500
 
-def notify_admin_pending_jobs(admin_user, pending_jobs, request=None):
-    """Send notification to admin about pending job approvals."""
-    if not pending_jobs.exists():
+# Rows removed per DELETE statement by clean_old_notifications
+NOTIFICATION_CLEANUP_BATCH_SIZE = 1000
+
+# Rendered emails larger than this are stripped directly rather than cached
+PLAIN_TEXT_CACHE_MAX_LENGTH = 32 * 1024
+
+@lru_cache(maxsize=1024)
+def _absolute_url(viewname, pk):
+    """Absolute URL of a per-object view; URL patterns are fixed, so results are memoized."""
+    return f"{SITE_URL}{reverse(viewname, args=[pk])}"
+
+@lru_cache(maxsize=256)
+def _cached_strip_tags(html):
+    return strip_tags(html)
+
+def _html_to_plain_text(html):
+    """Plain-text body for a rendered email; repeat bodies (bulk sends) skip the regex pass."""
+    if len(html) > PLAIN_TEXT_CACHE_MAX_LENGTH:
+        return strip_tags(html)
+    return _cached_strip_tags(html)
+
+def notify_admin_pending_jobs(admin_users, pending_jobs, request=None):
+    """Send notification to admins about pending job approvals."""
+    pending_count = pending_jobs.count()
+    if not pending_count:
         return
     
-    send_notification(
-        user=admin_user,
+    send_notifications_bulk(
+        users=admin_users,
         title='Jobs Pending Approval',
-        message=f'There are {pending_jobs.count()} jobs pending your approval.',
+        message=f'There are {pending_count} jobs pending your approval.',
         notification_type='info',
         template='emails/pending_jobs_notification.html',
-        pending_jobs=pending_jobs[:5],  # Limit to 5 most recent
-        pending_count=pending_jobs.count(),
-        request=request
-    )
-
-def notify_employer_application(employer, application, request=None):
-    """Send notification to employer about new job application."""
-    send_notification(
-        user=employer,
-        title='New Job Application Received',
-        message=f'New application received for "{application.job.title}" from {application.user.get_full_name()}',
-        notification_type='job_application',
-        template='emails/new_application_notification.html',
-        job=application.job,
-        application=application,
-        applicant=application.user,
+        pending_jobs=list(pending_jobs.select_related('user')[:5]),  # Limit to 5 most recent
+        pending_count=pending_count,
         request=request
     )
 
 def notify_application_status_update(application, request=None):
     """Send notification to job seeker about application status update."""
-    send_notification(
+    message = APPLICATION_STATUS_MESSAGES.get(
+        application.status, 'Your application for "{title}" has been updated.'
+    ).format(title=application.job.title)
+    
+    queue_notification(
         user=application.user,
         title='Application Status Updated',
-        message=f'Your application for "{application.job.title}" has been updated.',
+        message=message,
         notification_type='application_status',
         template='emails/application_status_update.html',
         job=application.job,
@@ -55,12 +112,16 @@ def notify_application_status_update(application, request=None):
 
 def notify_job_status_update(job, is_approved, feedback=None, request=None):
     """Send notification to employer about job approval/rejection."""
-    status = 'approved' if is_approved else 'rejected'
-    notification_type = 'job_approved' if is_approved else 'job_rejected'
-    title = 'Job Posting Approved' if is_approved else 'Job Posting Rejected'
-    message = f'Your job posting "{job.title}" has been {status}.'
+    if is_approved:
+        status, notification_type, title = 'approved', 'job_approved', 'Job Posting Approved'
+        message = f'Your job posting "{job.title}" has been approved and is now live.'
+        action_url = _absolute_url('jobs:job_detail', job.id)
+    else:
+        status, notification_type, title = 'rejected', 'job_rejected', 'Job Posting Rejected'
+        message = f'Your job posting "{job.title}" was not approved. Please review and update the posting.'
+        action_url = _absolute_url('jobs:edit_job', job.id)
     
-    send_notification(
+    queue_notification(
         user=job.user,
         title=title,
         message=message,
@@ -69,22 +130,83 @@ def notify_job_status_update(job, is_approved, feedback=None, request=None):
         job=job,
         status=status,
         feedback=feedback,
+        action_url=action_url,
         request=request
     )
 
 def clean_old_notifications(days=30):
     """Clean up old read notifications."""
     cutoff_date = timezone.now() - timedelta(days=days)
-    Notification.objects.filter(
+    old_notifications = Notification.objects.filter(
         Q(created_at__lt=cutoff_date),
         Q(is_read=True)
-    ).delete()
+    )
+    
+    # Delete in batches with raw DELETEs so memory and each statement's locks stay bounded;
+    # nothing references notifications, so skipping the cascade collector is safe
+    while True:
+        ids = list(old_notifications.values_list('pk', flat=True)[:NOTIFICATION_CLEANUP_BATCH_SIZE])
+        if not ids:
+            break
+        Notification.objects.filter(pk__in=ids)._raw_delete(Notification.objects.db)
 
 def get_site_url(request=None):
     """Get the full site URL."""
     if request:
         return f"{request.scheme}://{request.get_host()}"
-    return settings.SITE_URL
+    return SITE_URL
+
+def _rendered_email_cache_key(template, notification_type, context):
+    """Cache key for emails whose HTML depends only on the job and review outcome, else None."""
+    job = context.get('job')
+    if notification_type not in JOB_REVIEW_STATUS_CONTEXT or job is None:
+        return None
+    # updated_at changes with every job edit, so edited jobs never reuse an old body
+    raw = '|'.join(str(part) for part in (
+        template, job.pk, job.updated_at.isoformat(), notification_type,
+        context.get('feedback') or '', context['site_url'],
+    ))
+    return NOTIFICATION_HTML_CACHE_KEY.format(hashlib.blake2b(raw.encode(), digest_size=16).hexdigest())
+
+def _render_notification_email(title, message, notification_type, **kwargs):
+    """Render the ``(html, plain)`` email bodies for a notification; see ``send_notification``."""
+    template = kwargs.get('template', 'emails/notifications/generic.html')
+
+    # Base context for all email templates
+    context = {
+        'title': title,
+        'message': message,
+        'site_url': get_site_url(kwargs.get('request')),
+        'site_name': 'Job Portal',
+    }
+
+    # Add all additional kwargs to context
+    context.update({k: v for k, v in kwargs.items() if k != 'template' and k != 'request'})
+
+    # Status-specific context
+    if notification_type in JOB_REVIEW_STATUS_CONTEXT:
+        context.update(JOB_REVIEW_STATUS_CONTEXT[notification_type])
+    
+    elif notification_type == 'job_application':
+        status = kwargs.get('status', 'pending')
+        context.update({
+            'status': status,
+            'status_display': APPLICATION_STATUS_DISPLAY.get(status, status.title()),
+            'status_class': APPLICATION_STATUS_CLASSES.get(status, 'info')
+        })
+
+    # Render email templates; a sibling .txt template, when there is one, gives
+    # the plain-text part directly instead of stripping tags from the HTML
+    cache_key = _rendered_email_cache_key(template, notification_type, context)
+    html_message = cache.get(cache_key) if cache_key else None
+    if html_message is None:
+        html_message = get_email_template(template).render(context)
+        if cache_key:
+            cache.set(cache_key, html_message, NOTIFICATION_HTML_CACHE_TTL)
+    plain_template = get_plain_text_template(template)
+    if plain_template is None:
+        return html_message, _html_to_plain_text(html_message)
+    return html_message, plain_template.render(context)
 
 def send_notification(user, title, message, notification_type='info', **kwargs):
     """
@@ -103,15 +225,6 @@ def send_notification(user, title, message, notification_type='info', **kwargs):
             - feedback: Feedback message for job rejections
             - request: Request object for generating absolute URLs
     """
-    template = kwargs.get('template', 'emails/notifications/generic.html')
-    # Create in-app notification
-    Notification.objects.create(
-        recipient=user,
-        title=title,
-        message=message,
-        notification_type=notification_type
-    )
-    
     # Create in-app notification
     notification = Notification.objects.create(
         recipient=user,
@@ -120,52 +233,11 @@ def send_notification(user, title, message, notification_type='info', **kwargs):
         notification_type=notification_type
     )
 
-    # Base context for all email templates
-    context = {
-        'user': user,
-        'title': title,
-        'message': message,
-        'site_url': get_site_url(kwargs.get('request')),
-        'site_name': 'Job Portal',
-    }
-
-    # Add all additional kwargs to context
-    context.update({k: v for k, v in kwargs.items() if k != 'template' and k != 'request'})
-
-    # Status-specific context
-    if notification_type in ['job_approved', 'job_rejected']:
-        context['status'] = 'approved' if notification_type == 'job_approved' else 'rejected'
-        context['status_display'] = 'Approved' if notification_type == 'job_approved' else 'Rejected'
-        context['status_class'] = 'success' if notification_type == 'job_approved' else 'danger'
+    html_message, plain_message = _render_notification_email(title, message, notification_type, user=user, **kwargs)
     
-    elif notification_type == 'job_application':
-        status = kwargs.get('status', 'pending')
-        status_display_map = {
-            'pending': 'Pending Review',
-            'reviewing': 'Under Review',
-            'shortlisted': 'Shortlisted',
-            'accepted': 'Accepted',
-            'rejected': 'Rejected'
-        }
-        status_class_map = {
-            'pending': 'warning',
-            'reviewing': 'info',
-            'shortlisted': 'info',
-            'accepted': 'success',
-            'rejected': 'danger'
-        }
-        context.update({
-            'status': status,
-            'status_display': status_display_map.get(status, status.title()),
-            'status_class': status_class_map.get(status, 'info')
-        })
-
-    # Render email templates
-    html_message = render_to_string(template, context)
-    plain_message = strip_tags(html_message)
-    
-    # Send email
-    send_mail(
+    # Hand SMTP delivery to the email queue so a slow or failing mail server
+    # does not hold up (or repeat) the in-app notification
+    queue_email(
         subject=title,
         message=plain_message,
         html_message=html_message,
@@ -174,71 +246,76 @@ def send_notification(user, title, message, notification_type='info', **kwargs):
         fail_silently=False,
     )
 
+def send_notifications_bulk(users, title, message, notification_type='info', **kwargs):
+    """
+    Send the same email and in-app notification to many users.
+    
+    Takes the same arguments as ``send_notification``, but the email context must not
+    depend on the recipient: it is rendered once and the in-app rows are inserted together.
+    """
+    users = list(users)
+    if not users:
+        return
+
+    Notification.objects.bulk_create(
+        [
+            Notification(recipient=user, title=title, message=message, notification_type=notification_type)
+            for user in users
+        ],
+        batch_size=NOTIFICATION_BATCH_SIZE,
+    )
+
+    html_message, plain_message = _render_notification_email(title, message, notification_type, **kwargs)
+    # Batched so each worker task sends many emails over one SMTP connection
+    queue_emails(
+        {
+            'subject': title,
+            'message': plain_message,
+            'html_message': html_message,
+            'from_email': settings.DEFAULT_FROM_EMAIL,
+            'recipient_list': [user.email],
+        }
+        for user in users
+    )
+
+def queue_notification(user, title, message, notification_type='info', **kwargs):
+    """
+    Queue ``send_notification`` for a Celery worker once the current transaction commits.
+    
+    Accepts the same arguments as ``send_notification``. Model instances (job,
+    application, applicant) are sent as ids and the request is reduced to the
+    site URL, so the task arguments stay JSON-serializable.
+    """
+    request = kwargs.pop('request', None)
+    if request is not None:
+        kwargs.setdefault('site_url', get_site_url(request))
+    for name in ('job', 'application', 'applicant'):
+        obj = kwargs.pop(name, None)
+        if obj is not None:
+            kwargs[f'{name}_id'] = obj.pk
+    
+    transaction.on_commit(partial(
+        send_notification_async.delay, user.pk, title, message, notification_type, **kwargs
+    ))
+
 def notify_job_application(application):
     """Send notification for new job application"""
     # Notify employer
-    send_notification(
+    queue_notification(
         user=application.job.user,
         title=f"New application for {application.job.title}",
         message=f"{application.user.get_full_name()} has applied for your job posting.",
         notification_type='job_application',
         job=application.job,
-        action_url=f"{settings.SITE_URL}{reverse('dashboard:application_detail', args=[application.id])}"
+        action_url=_absolute_url('dashboard:application_detail', application.id)
     )
     
     # Notify applicant
-    send_notification(
+    queue_notification(
         user=application.user,
         title=f"Application submitted for {application.job.title}",
         message="Your application has been successfully submitted and is under review.",
         notification_type='job_application',
         job=application.job,
-        action_url=f"{settings.SITE_URL}{reverse('jobs:job_detail', args=[application.job.id])}"
+        action_url=_absolute_url('jobs:job_detail', application.job.id)
     )
-
-def notify_job_status_update(application, status):
-    """Send notification for job application status update"""
-    status_messages = {
-        'approved': 'Your job application has been approved!',
-        'rejected': 'Unfortunately, your job application was not selected.',
-        'under_review': 'Your application is currently under review.',
-        'shortlisted': 'Congratulations! Your application has been shortlisted.',
-    }
-    
-    notification_types = {
-        'approved': 'success',
-        'rejected': 'error',
-        'under_review': 'info',
-        'shortlisted': 'success',
-    }
-    
-    if status in status_messages:
-        send_notification(
-            user=application.user,
-            title=f"Application Status Update - {application.job.title}",
-            message=status_messages[status],
-            notification_type=notification_types[status],
-            job=application.job,
-            action_url=f"{settings.SITE_URL}{reverse('jobs:job_detail', args=[application.job.id])}"
-        )
-
-def notify_job_approval_status(job, is_approved):
-    """Send notification for job posting approval status"""
-    if is_approved:
-        send_notification(
-            user=job.user,
-            title="Job Posting Approved",
-            message=f"Your job posting for {job.title} has been approved and is now live.",
-            notification_type='job_approved',
-            job=job,
-            action_url=f"{settings.SITE_URL}{reverse('jobs:job_detail', args=[job.id])}"
-        )
-    else:
-        send_notification(
-            user=job.user,
-            title="Job Posting Not Approved",
-            message=f"Your job posting for {job.title} was not approved. Please review and update the posting.",
-            notification_type='job_rejected',
-            job=job,
-            action_url=f"{settings.SITE_URL}{reverse('dashboard:edit_job', args=[job.id])}"
-        )
@@ -1,41 +1,65 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from django.core.paginator import Paginator
-from django.views.decorators.http import require_POST
+from django.db.models import Count, Max, Q, Window
+from django.views.decorators.http import condition, require_POST
+from django.utils import timezone
 from django.utils.timesince import timesince
+from core.pagination import paginate_by_cursor
 from .models import Notification
 
+# Columns the notification list and dropdown render; the recipient is always the current user
+NOTIFICATION_LIST_FIELDS = ('id', 'title', 'message', 'notification_type', 'is_read', 'created_at')
+
+# Notifications shown per list page
+NOTIFICATIONS_PER_PAGE = 10
+
+# The dropdown shows relative times ("5 minutes ago"), so its ETag changes at least this often
+DROPDOWN_ETAG_SECONDS = 60
+
+def _dropdown_etag(request):
+    """ETag for the JSON dropdown, so polls with nothing new get a 304; None for the HTML page."""
+    if request.GET.get('format') != 'json':
+        return None
+    state = Notification.objects.filter(recipient=request.user).aggregate(
+        latest=Max('created_at'),
+        total=Count('id'),
+        unread=Count('id', filter=Q(is_read=False)),
+    )
+    latest = state['latest'].timestamp() if state['latest'] else 0
+    bucket = int(timezone.now().timestamp() // DROPDOWN_ETAG_SECONDS)
+    return f"{request.user.pk}-{latest}-{state['total']}-{state['unread']}-{bucket}"
+
 @login_required
+@condition(etag_func=_dropdown_etag)
 def notification_list(request):
     """View for listing user's notifications"""
-    notifications = Notification.objects.filter(recipient=request.user)
+    notifications = Notification.objects.filter(recipient=request.user).only(*NOTIFICATION_LIST_FIELDS)
     
     # Handle JSON request for dropdown notifications
     if request.GET.get('format') == 'json':
-        unread_count = notifications.filter(is_read=False).count()
-        recent_notifications = notifications[:5]  # Get 5 most recent notifications
-        
-        notifications_data = []
-        for notification in recent_notifications:
-            notifications_data.append({
-                'id': notification.id,
-                'title': notification.title,
-                'message': notification.message,
-                'type': notification.notification_type,
-                'is_read': notification.is_read,
-                'created_at': timesince(notification.created_at) + ' ago'
-            })
+        # 5 most recent notifications as plain dicts; no model instances are built.
+        # The window count is taken over all of the user's rows before the LIMIT,
+        # so the unread total comes back in the same query.
+        notifications_data = list(
+            notifications
+            .annotate(unread_total=Window(expression=Count('id', filter=Q(is_read=False))))
+            .values(*NOTIFICATION_LIST_FIELDS, 'unread_total')[:5]
+        )
+        # No rows means no notifications at all, so nothing is unread either
+        unread_count = notifications_data[0]['unread_total'] if notifications_data else 0
+        for row in notifications_data:
+            del row['unread_total']
+            row['type'] = row.pop('notification_type')
+            row['created_at'] = timesince(row['created_at']) + ' ago'
         
         return JsonResponse({
             'unread_count': unread_count,
             'notifications': notifications_data
         })
     
-    # Handle regular page request
-    paginator = Paginator(notifications, 10)  # Show 10 notifications per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Handle regular page request; keyset pages stay an index seek however deep the user pages
+    page_obj = paginate_by_cursor(notifications, request.GET.get('after', ''), NOTIFICATIONS_PER_PAGE)
     
     return render(request, 'notifications/notification_list.html', {'page_obj': page_obj})
 
@@ -43,17 +67,16 @@ def notification_list(request):
 @require_POST
 def mark_notification_read(request, notification_id):
     """API endpoint for marking a notification as read"""
-    try:
-        notification = Notification.objects.get(id=notification_id, recipient=request.user)
-        notification.is_read = True
-        notification.save()
-        return JsonResponse({'status': 'success'})
-    except Notification.DoesNotExist:
+    # A single UPDATE; no matching row means it does not exist or is not this user's
+    updated = Notification.objects.filter(id=notification_id, recipient=request.user).update(is_read=True)
+    if not updated:
         return JsonResponse({'status': 'error', 'message': 'Notification not found'}, status=404)
+    return JsonResponse({'status': 'success'})
 
 @login_required
 @require_POST
 def mark_all_notifications_read(request):
     """API endpoint for marking all notifications as read"""
-    Notification.objects.filter(recipient=request.user).update(is_read=True)
+    # Already-read rows are left alone rather than rewritten
+    Notification.objects.filter(recipient=request.user, is_read=False).update(is_read=True)
     return JsonResponse({'status': 'success'})